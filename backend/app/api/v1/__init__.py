@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import contacts, news, cases, auth, users, company, services, dashboard, upload, page_views
+from app.api.v1.endpoints import contacts, news, cases, auth, users, company, services, dashboard, upload, page_views, search
 
 api_router = APIRouter()
 
@@ -13,3 +13,4 @@ api_router.include_router(services.router)
 api_router.include_router(dashboard.router)
 api_router.include_router(upload.router)
 api_router.include_router(page_views.router)
+api_router.include_router(search.router)
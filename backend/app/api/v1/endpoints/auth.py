@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from typing import Optional
-from app.core.database import get_db
+import time
+from app.core.auth_cache import auth_cache
+from app.core.database import get_db, fetch_first
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher
+from app.core.writer import run_write
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
 
@@ -26,51 +31,69 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _resolve_user(token: str, db: Session):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="无法验证凭据",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+    user_id = auth_cache.get_token(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            user_id = payload.get("sub")
+            if user_id is None:
+                raise credentials_exception
+            user_id = int(user_id)
+        except (JWTError, ValueError, TypeError):
             raise credentials_exception
-        user_id = int(user_id)
-    except (JWTError, ValueError, TypeError):
-        raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
+        auth_cache.set_token(token, user_id, payload.get("exp"))
+    user = auth_cache.get_user(user_id)
     if user is None:
-        raise credentials_exception
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        auth_cache.set_user(user)
     return user
 
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    start = time.perf_counter()
+    try:
+        return _resolve_user(token, db)
+    finally:
+        auth_cache.record_lookup((time.perf_counter() - start) * 1000)
+
+
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user.username).first()
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await fetch_first(db, select(User).where(User.username == user.username))
     if db_user:
         raise HTTPException(status_code=400, detail="用户名已存在")
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await fetch_first(db, select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="邮箱已被注册")
     
-    hashed_password = get_password_hash(user.password)
-    new_user = User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    hashed_password = await password_hasher.hash(user.password)
+
+    def write(session):
+        new_user = User(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password
+        )
+        session.add(new_user)
+        session.flush()
+        session.refresh(new_user)
+        return UserResponse.model_validate(new_user)
+
+    return await run_in_threadpool(run_write, db, write)
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await fetch_first(db, select(User).where(User.username == form_data.username))
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
@@ -86,3 +109,8 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 @router.get("/me", response_model=UserResponse)
 def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
+
+
+@router.get("/password-stats")
+def get_password_stats(current_user: User = Depends(get_current_user)):
+    return password_hasher.stats()
@@ -1,63 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import json
-from app.core.database import get_db
+from app.core.bulk import run_bulk
+from app.core.cache import response_cache
+from app.core.database import get_db, get_read_db, fetch_all, fetch_first
+from app.core.fieldsets import load_only_fields, parse_fields
+from app.core.http_cache import conditional_get
+from app.core.pagination import keyset_filter, keyset_order, next_cursor_headers
+from app.core.writer import run_write
 from app.models.case import Case
 from app.models.user import User
 from app.api.v1.endpoints.auth import get_current_user
-from app.schemas.case import CaseCreate, CaseUpdate, CaseResponse
+from app.schemas.case import CaseBulkRequest, CaseCreate, CaseUpdate, CaseResponse, CaseListItem
 
 router = APIRouter(prefix="/cases", tags=["cases"])
 
 
-def case_to_response(case: Case) -> dict:
-    images = []
-    if case.images:
-        try:
-            images = json.loads(case.images)
-        except:
-            images = []
-    return {
-        "id": case.id,
-        "title": case.title,
-        "description": case.description,
-        "location": case.location,
-        "service_type": case.service_type,
-        "area": case.area,
-        "cover_image": case.cover_image,
-        "images": images,
-        "is_featured": case.is_featured,
-        "created_at": case.created_at,
-    }
-
-
-@router.get("/", response_model=List[CaseResponse])
-def get_cases(
+CASE_FIELDS = (
+    "id", "title", "description", "location", "service_type", "area",
+    "cover_image", "images", "is_featured", "created_at",
+)
+
+
+def case_to_response(case: Case, fields=CASE_FIELDS) -> dict:
+    return {field: getattr(case, field) for field in fields}
+
+
+@router.get("/", response_model=List[CaseListItem], response_model_exclude_unset=True)
+async def get_cases(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     service_type: Optional[str] = None,
     featured: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db=Depends(get_read_db)
 ):
-    query = db.query(Case)
-    if service_type:
-        query = query.filter(Case.service_type == service_type)
-    if featured is not None:
-        if featured:
-            query = query.filter(Case.is_featured == 1)
+    selected = parse_fields(fields, CASE_FIELDS)
+
+    async def load():
+        query = select(Case)
+        if selected:
+            query = query.options(load_only_fields(Case, selected))
+        if service_type:
+            query = query.where(Case.service_type == service_type)
+        if featured is not None:
+            if featured:
+                query = query.where(Case.is_featured == 1)
+            else:
+                query = query.where(Case.is_featured == 0)
+        query = query.order_by(*keyset_order(Case))
+        if cursor:
+            query = query.where(keyset_filter(Case, cursor))
         else:
-            query = query.filter(Case.is_featured == 0)
-    cases = query.order_by(Case.created_at.desc()).offset(skip).limit(limit).all()
-    return [case_to_response(c) for c in cases]
+            query = query.offset(skip)
+        cases = await fetch_all(db, query.limit(limit))
+        return [case_to_response(c, selected or CASE_FIELDS) for c in cases]
+
+    key = response_cache.key(
+        "cases:list", skip=skip, limit=limit, service_type=service_type, featured=featured, cursor=cursor,
+        fields=selected,
+    )
+    return await conditional_get(
+        request, "cases", key, load, extra_headers=lambda items: next_cursor_headers(items, limit)
+    )
 
 
 @router.get("/{case_id}", response_model=CaseResponse)
-def get_case(case_id: int, db: Session = Depends(get_db)):
-    case = db.query(Case).filter(Case.id == case_id).first()
-    if not case:
-        raise HTTPException(status_code=404, detail="案例不存在")
-    return case_to_response(case)
+async def get_case(
+    case_id: int,
+    request: Request,
+    db=Depends(get_read_db)
+):
+    async def load():
+        case = await fetch_first(db, select(Case).where(Case.id == case_id))
+        if not case:
+            raise HTTPException(status_code=404, detail="案例不存在")
+        return case_to_response(case)
+
+    key = response_cache.key("cases:detail", case_id=case_id)
+    return await conditional_get(request, "cases", key, load)
 
 
 @router.post("/", response_model=CaseResponse)
@@ -67,13 +91,17 @@ def create_case(
     current_user: User = Depends(get_current_user)
 ):
     case_data = case.model_dump()
-    if case_data.get("images"):
-        case_data["images"] = json.dumps(case_data["images"])
-    db_case = Case(**case_data)
-    db.add(db_case)
-    db.commit()
-    db.refresh(db_case)
-    return case_to_response(db_case)
+
+    def write(session):
+        db_case = Case(**case_data)
+        session.add(db_case)
+        session.flush()
+        session.refresh(db_case)
+        return case_to_response(db_case)
+
+    result = run_write(db, write)
+    response_cache.bump("cases")
+    return result
 
 
 @router.put("/{case_id}", response_model=CaseResponse)
@@ -83,17 +111,21 @@ def update_case(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_case = db.query(Case).filter(Case.id == case_id).first()
-    if not db_case:
-        raise HTTPException(status_code=404, detail="案例不存在")
     update_data = case.model_dump(exclude_unset=True)
-    if "images" in update_data and update_data["images"] is not None:
-        update_data["images"] = json.dumps(update_data["images"])
-    for key, value in update_data.items():
-        setattr(db_case, key, value)
-    db.commit()
-    db.refresh(db_case)
-    return case_to_response(db_case)
+
+    def write(session):
+        db_case = session.query(Case).filter(Case.id == case_id).first()
+        if not db_case:
+            raise HTTPException(status_code=404, detail="案例不存在")
+        for key, value in update_data.items():
+            setattr(db_case, key, value)
+        session.flush()
+        session.refresh(db_case)
+        return case_to_response(db_case)
+
+    result = run_write(db, write)
+    response_cache.bump("cases")
+    return result
 
 
 @router.delete("/{case_id}")
@@ -102,9 +134,23 @@ def delete_case(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_case = db.query(Case).filter(Case.id == case_id).first()
-    if not db_case:
-        raise HTTPException(status_code=404, detail="案例不存在")
-    db.delete(db_case)
-    db.commit()
+    def write(session):
+        db_case = session.query(Case).filter(Case.id == case_id).first()
+        if not db_case:
+            raise HTTPException(status_code=404, detail="案例不存在")
+        session.delete(db_case)
+
+    run_write(db, write)
+    response_cache.bump("cases")
     return {"message": "案例已删除"}
+
+
+@router.post("/bulk")
+def bulk_cases(
+    payload: CaseBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = run_bulk(db, Case, payload)
+    response_cache.bump("cases", "dashboard")
+    return result
@@ -1,35 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.pagination import created_at_param, keyset_filter, keyset_order, set_next_cursor
+from app.core.rate_limit import rate_limit
+from app.core.responses import dumps
+from app.core.writer import run_write, write_queue
 from app.models.contact import Contact
-from app.schemas.contact import ContactCreate, ContactResponse
+from app.schemas.contact import ContactBulkStatus, ContactCreate, ContactResponse
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
+EXPORT_COLUMNS = ["id", "name", "phone", "email", "address", "service_type", "message", "status", "created_at"]
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
 
-@router.post("/", response_model=ContactResponse)
+
+def contact_filters(status=None, created_after=None, created_before=None, ids=None) -> list:
+    filters = []
+    if status:
+        filters.append(Contact.status == status)
+    if created_after:
+        filters.append(Contact.created_at >= created_at_param(created_after))
+    if created_before:
+        filters.append(Contact.created_at < created_at_param(created_before))
+    if ids:
+        filters.append(Contact.id.in_(ids))
+    return filters
+
+
+def csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    value = str(value)
+    if value[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+
+def export_rows(filters: list, fmt: str):
+    db = SessionLocal()
+    try:
+        statement = (
+            select(*[getattr(Contact, c) for c in EXPORT_COLUMNS])
+            .where(*filters)
+            .order_by(Contact.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            buffer.write("\ufeff")
+            writer.writerow(EXPORT_COLUMNS)
+        for row in db.execute(statement):
+            if fmt == "csv":
+                writer.writerow([csv_cell(v) for v in row])
+            else:
+                buffer.write(dumps(dict(zip(EXPORT_COLUMNS, row))).decode("utf-8"))
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+contact_rate_limit = rate_limit(
+    "contacts",
+    settings.CONTACT_RATE_LIMIT,
+    settings.CONTACT_RATE_BURST,
+    overloaded=lambda: write_queue.pending() >= settings.WRITE_QUEUE_MAX_PENDING,
+)
+
+
+@router.post("/", response_model=ContactResponse, dependencies=[Depends(contact_rate_limit)])
 def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
-    db_contact = Contact(**contact.model_dump())
-    db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
+    contact_data = contact.model_dump()
+
+    def write(session):
+        db_contact = Contact(**contact_data)
+        session.add(db_contact)
+        session.flush()
+        session.refresh(db_contact)
+        return ContactResponse.model_validate(db_contact)
+
+    return run_write(db, write)
 
 
 @router.get("/", response_model=List[ContactResponse])
 def get_contacts(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    contacts = db.query(Contact).offset(skip).limit(limit).all()
+    query = db.query(Contact).order_by(*keyset_order(Contact))
+    if cursor:
+        query = query.filter(keyset_filter(Contact, cursor))
+    else:
+        query = query.offset(skip)
+    contacts = query.limit(limit).all()
+    set_next_cursor(response, contacts, limit)
     return contacts
 
 
+@router.get("/export")
+def export_contacts(
+    format: str = "csv",
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="导出格式只支持 csv 或 ndjson")
+    filters = contact_filters(status, created_after, created_before)
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    filename = f"contacts-{datetime.now().strftime('%Y%m%d%H%M%S')}.{format}"
+    return StreamingResponse(
+        export_rows(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/status")
+def bulk_update_contact_status(
+    payload: ContactBulkStatus,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    filters = contact_filters(payload.from_status, payload.created_after, payload.created_before, payload.ids)
+    if not filters:
+        raise HTTPException(status_code=400, detail="请至少指定一个筛选条件")
+    def write(session):
+        return session.execute(
+            update(Contact).where(*filters).values(status=payload.status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    updated = run_write(db, write)
+    response_cache.bump("dashboard")
+    return {"updated": updated, "status": payload.status}
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 def get_contact(
     contact_id: int, 
@@ -49,10 +179,13 @@ def update_contact_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not contact:
-        raise HTTPException(status_code=404, detail="联系记录不存在")
-    contact.status = status
-    db.commit()
-    db.refresh(contact)
-    return contact
+    def write(session):
+        contact = session.query(Contact).filter(Contact.id == contact_id).first()
+        if not contact:
+            raise HTTPException(status_code=404, detail="联系记录不存在")
+        contact.status = status
+        session.flush()
+        session.refresh(contact)
+        return ContactResponse.model_validate(contact)
+
+    return run_write(db, write)
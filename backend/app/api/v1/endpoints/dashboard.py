@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import case, event, func, select
 from sqlalchemy.orm import Session
+from app.core.auth_cache import auth_cache
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.rate_limit import rate_limiter
 from app.core.database import get_db
+from app.core.upload_server import upload_server
+from app.core.writer import write_queue
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User
 from app.models.news import News
@@ -8,36 +15,60 @@ from app.models.case import Case
 from app.models.contact import Contact
 from app.models.service import Service
 from datetime import datetime
+from itertools import chain
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
+DASHBOARD_MODELS = (Contact, News, Case, Service)
+
+
+# flush 时只做标记，提交后再失效缓存；否则提交前的并发读取会把旧数据写进新版本的缓存
+@event.listens_for(Session, "after_flush")
+def _mark_dashboard_dirty(session, flush_context):
+    if any(isinstance(obj, DASHBOARD_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["dashboard_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboard(session):
+    if session.info.pop("dashboard_dirty", False):
+        response_cache.bump("dashboard")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dashboard_mark(session):
+    session.info.pop("dashboard_dirty", None)
+
+
 @router.get("/stats")
 def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    pending_contacts = db.query(Contact).filter(Contact.status == "pending").count()
-    total_contacts = db.query(Contact).count()
-    total_news = db.query(News).count()
-    total_cases = db.query(Case).count()
-    total_services = db.query(Service).count()
-    
     today = datetime.now().date()
     month_start = today.replace(day=1)
     
-    contacts_this_month = db.query(Contact).filter(
-        Contact.created_at >= month_start
-    ).count()
+    def load():
+        contact_stats = select(
+            func.count(Contact.id).label("total_contacts"),
+            func.coalesce(func.sum(case((Contact.status == "pending", 1), else_=0)), 0).label("pending_contacts"),
+            func.coalesce(func.sum(case((Contact.created_at >= month_start, 1), else_=0)), 0).label("contacts_this_month"),
+        ).subquery()
+        stats = db.execute(
+            select(
+                contact_stats.c.pending_contacts,
+                contact_stats.c.total_contacts,
+                select(func.count(News.id)).scalar_subquery().label("total_news"),
+                select(func.count(Case.id)).scalar_subquery().label("total_cases"),
+                select(func.count(Service.id)).scalar_subquery().label("total_services"),
+                contact_stats.c.contacts_this_month,
+            )
+        ).one()
+        return dict(stats._mapping)
     
-    return {
-        "pending_contacts": pending_contacts,
-        "total_contacts": total_contacts,
-        "total_news": total_news,
-        "total_cases": total_cases,
-        "total_services": total_services,
-        "contacts_this_month": contacts_this_month,
-    }
+    key = response_cache.key("dashboard:stats", month_start=month_start)
+    return response_cache.get_or_load("dashboard", key, load, ttl=settings.DASHBOARD_CACHE_TTL)
 
 
 @router.get("/recent-contacts")
@@ -46,19 +77,33 @@ def get_recent_contacts(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    contacts = db.query(Contact).order_by(Contact.created_at.desc()).limit(limit).all()
-    
-    result = []
-    for contact in contacts:
-        phone = contact.phone or ""
-        masked_phone = phone[:3] + "****" + phone[-4:] if len(phone) >= 7 else phone
-        result.append({
-            "id": contact.id,
-            "name": contact.name,
-            "phone": masked_phone,
-            "service_type": contact.service_type,
-            "status": contact.status,
-            "created_at": contact.created_at.isoformat() if contact.created_at else None,
-        })
+    def load():
+        contacts = db.query(Contact).order_by(Contact.created_at.desc()).limit(limit).all()
+        
+        result = []
+        for contact in contacts:
+            phone = contact.phone or ""
+            masked_phone = phone[:3] + "****" + phone[-4:] if len(phone) >= 7 else phone
+            result.append({
+                "id": contact.id,
+                "name": contact.name,
+                "phone": masked_phone,
+                "service_type": contact.service_type,
+                "status": contact.status,
+                "created_at": contact.created_at.isoformat() if contact.created_at else None,
+            })
+        return result
     
-    return result
+    key = response_cache.key("dashboard:recent-contacts", limit=limit)
+    return response_cache.get_or_load("dashboard", key, load, ttl=settings.DASHBOARD_CACHE_TTL)
+
+
+@router.get("/cache-stats")
+def get_cache_stats(current_user: User = Depends(get_current_user)):
+    return {
+        "response_cache": response_cache.stats(),
+        "auth_cache": auth_cache.stats(),
+        "uploads": upload_server.stats(),
+        "write_queue": write_queue.stats(),
+        "rate_limit": rate_limiter.stats(),
+    }
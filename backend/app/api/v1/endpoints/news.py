@@ -1,62 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import json
-from app.core.database import get_db
+from app.core.bulk import run_bulk
+from app.core.cache import response_cache
+from app.core.database import get_db, get_read_db, fetch_all, fetch_first
+from app.core.fieldsets import load_only_fields, parse_fields
+from app.core.http_cache import conditional_get
+from app.core.pagination import keyset_filter, keyset_order, next_cursor_headers
+from app.core.view_counter import news_view_counter
+from app.core.writer import run_write
 from app.models.news import News
 from app.models.user import User
 from app.api.v1.endpoints.auth import get_current_user
-from app.schemas.news import NewsCreate, NewsUpdate, NewsResponse
+from app.schemas.news import NewsBulkRequest, NewsCreate, NewsUpdate, NewsResponse, NewsListItem
 
 router = APIRouter(prefix="/news", tags=["news"])
 
 
-def news_to_response(news: News) -> dict:
-    images = []
-    if news.images:
-        try:
-            images = json.loads(news.images)
-        except:
-            images = []
-    return {
-        "id": news.id,
-        "title": news.title,
-        "summary": news.summary,
-        "content": news.content,
-        "cover_image": news.cover_image,
-        "images": images,
-        "category": news.category,
-        "is_published": news.is_published,
-        "view_count": news.view_count,
-        "created_at": news.created_at,
-    }
-
-
-@router.get("/", response_model=List[NewsResponse])
-def get_news_list(
+NEWS_FIELDS = (
+    "id", "title", "summary", "content", "cover_image", "images",
+    "category", "is_published", "view_count", "created_at",
+)
+
+
+def news_to_response(news: News, fields=NEWS_FIELDS) -> dict:
+    return {field: getattr(news, field) for field in fields}
+
+
+@router.get("/", response_model=List[NewsListItem], response_model_exclude_unset=True)
+async def get_news_list(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
     published: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db=Depends(get_read_db)
 ):
-    query = db.query(News)
-    if category:
-        query = query.filter(News.category == category)
-    if published is not None:
-        query = query.filter(News.is_published == published)
-    news_list = query.order_by(News.created_at.desc()).offset(skip).limit(limit).all()
-    return [news_to_response(n) for n in news_list]
+    selected = parse_fields(fields, NEWS_FIELDS)
+
+    async def load():
+        query = select(News)
+        if selected:
+            query = query.options(load_only_fields(News, selected))
+        if category:
+            query = query.where(News.category == category)
+        if published is not None:
+            query = query.where(News.is_published == published)
+        query = query.order_by(*keyset_order(News))
+        if cursor:
+            query = query.where(keyset_filter(News, cursor))
+        else:
+            query = query.offset(skip)
+        news_list = await fetch_all(db, query.limit(limit))
+        return [news_to_response(n, selected or NEWS_FIELDS) for n in news_list]
+
+    key = response_cache.key(
+        "news:list", skip=skip, limit=limit, category=category, published=published, cursor=cursor,
+        fields=selected,
+    )
+    return await conditional_get(
+        request, "news", key, load, extra_headers=lambda items: next_cursor_headers(items, limit)
+    )
 
 
 @router.get("/{news_id}", response_model=NewsResponse)
-def get_news(news_id: int, db: Session = Depends(get_db)):
-    news = db.query(News).filter(News.id == news_id).first()
-    if not news:
-        raise HTTPException(status_code=404, detail="新闻不存在")
-    news.view_count += 1
-    db.commit()
-    return news_to_response(news)
+async def get_news(
+    news_id: int,
+    request: Request,
+    db=Depends(get_read_db)
+):
+    async def load():
+        news = await fetch_first(db, select(News).where(News.id == news_id))
+        if not news:
+            raise HTTPException(status_code=404, detail="新闻不存在")
+        return news_to_response(news)
+
+    key = response_cache.key("news:detail", news_id=news_id)
+    result = await conditional_get(request, "news", key, load)
+    news_view_counter.increment(news_id)
+    return result
 
 
 @router.post("/", response_model=NewsResponse)
@@ -66,13 +91,17 @@ def create_news(
     current_user: User = Depends(get_current_user)
 ):
     news_data = news.model_dump()
-    if news_data.get("images"):
-        news_data["images"] = json.dumps(news_data["images"])
-    db_news = News(**news_data)
-    db.add(db_news)
-    db.commit()
-    db.refresh(db_news)
-    return news_to_response(db_news)
+
+    def write(session):
+        db_news = News(**news_data)
+        session.add(db_news)
+        session.flush()
+        session.refresh(db_news)
+        return news_to_response(db_news)
+
+    result = run_write(db, write)
+    response_cache.bump("news")
+    return result
 
 
 @router.put("/{news_id}", response_model=NewsResponse)
@@ -82,17 +111,21 @@ def update_news(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_news = db.query(News).filter(News.id == news_id).first()
-    if not db_news:
-        raise HTTPException(status_code=404, detail="新闻不存在")
     update_data = news.model_dump(exclude_unset=True)
-    if "images" in update_data and update_data["images"] is not None:
-        update_data["images"] = json.dumps(update_data["images"])
-    for key, value in update_data.items():
-        setattr(db_news, key, value)
-    db.commit()
-    db.refresh(db_news)
-    return news_to_response(db_news)
+
+    def write(session):
+        db_news = session.query(News).filter(News.id == news_id).first()
+        if not db_news:
+            raise HTTPException(status_code=404, detail="新闻不存在")
+        for key, value in update_data.items():
+            setattr(db_news, key, value)
+        session.flush()
+        session.refresh(db_news)
+        return news_to_response(db_news)
+
+    result = run_write(db, write)
+    response_cache.bump("news")
+    return result
 
 
 @router.delete("/{news_id}")
@@ -101,9 +134,23 @@ def delete_news(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_news = db.query(News).filter(News.id == news_id).first()
-    if not db_news:
-        raise HTTPException(status_code=404, detail="新闻不存在")
-    db.delete(db_news)
-    db.commit()
+    def write(session):
+        db_news = session.query(News).filter(News.id == news_id).first()
+        if not db_news:
+            raise HTTPException(status_code=404, detail="新闻不存在")
+        session.delete(db_news)
+
+    run_write(db, write)
+    response_cache.bump("news")
     return {"message": "新闻已删除"}
+
+
+@router.post("/bulk")
+def bulk_news(
+    payload: NewsBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = run_bulk(db, News, payload)
+    response_cache.bump("news", "dashboard")
+    return result
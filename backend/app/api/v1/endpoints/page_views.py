@@ -2,31 +2,57 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, date, timedelta
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.page_view import PageView
+from app.core.page_view_buffer import page_view_buffer
+from app.core.page_view_rollup import apply_page_views
+from app.core.rate_limit import client_ip, rate_limit
+from app.core.writer import run_write
+from app.models.page_view import PageView, PageViewDaily, PageViewDailyPage
 from app.models.user import User
 from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter(prefix="/page-views", tags=["page-views"])
 
 
-@router.post("/record")
+page_view_rate_limit = rate_limit(
+    "page-views",
+    settings.PAGE_VIEW_RATE_LIMIT,
+    settings.PAGE_VIEW_RATE_BURST,
+    overloaded=lambda: settings.PAGE_VIEW_BUFFER_ENABLED and page_view_buffer.pending() >= page_view_buffer.max_size,
+)
+
+
+@router.post("/record", dependencies=[Depends(page_view_rate_limit)])
 def record_page_view(
     page: str,
     request: Request,
     db: Session = Depends(get_db)
 ):
-    page_view = PageView(
-        page=page,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent", "")[:500] if request.headers.get("user-agent") else None,
-        view_date=date.today(),
-    )
-    db.add(page_view)
-    db.commit()
+    row = {
+        "page": page,
+        "ip_address": client_ip(request),
+        "user_agent": request.headers.get("user-agent", "")[:500] if request.headers.get("user-agent") else None,
+        "view_date": date.today(),
+        "created_at": datetime.utcnow(),
+    }
+    if settings.PAGE_VIEW_BUFFER_ENABLED:
+        if not page_view_buffer.enqueue(row):
+            return {"status": "dropped"}
+        return {"status": "ok"}
+    def write(session):
+        session.add(PageView(**row))
+        apply_page_views(session, [row])
+
+    run_write(db, write)
     return {"status": "ok"}
 
 
+@router.get("/ingest-stats")
+def get_page_view_ingest_stats(current_user: User = Depends(get_current_user)):
+    return page_view_buffer.stats()
+
+
 @router.get("/stats")
 def get_page_view_stats(
     db: Session = Depends(get_db),
@@ -37,32 +63,33 @@ def get_page_view_stats(
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
-    total_views = db.query(func.count(PageView.id)).scalar() or 0
-    today_views = db.query(func.count(PageView.id)).filter(PageView.view_date == today).scalar() or 0
-    yesterday_views = db.query(func.count(PageView.id)).filter(PageView.view_date == yesterday).scalar() or 0
-    week_views = db.query(func.count(PageView.id)).filter(PageView.view_date >= week_ago).scalar() or 0
-    month_views = db.query(func.count(PageView.id)).filter(PageView.view_date >= month_ago).scalar() or 0
+    total_views = db.query(func.sum(PageViewDaily.count)).scalar() or 0
     
-    daily_stats = db.query(
-        PageView.view_date,
-        func.count(PageView.id).label('count')
-    ).filter(
-        PageView.view_date >= week_ago
-    ).group_by(
-        PageView.view_date
+    recent_days = db.query(PageViewDaily).filter(
+        PageViewDaily.view_date >= month_ago
     ).order_by(
-        PageView.view_date
+        PageViewDaily.view_date
     ).all()
     
-    daily_data = [{"date": str(stat.view_date), "count": stat.count} for stat in daily_stats]
+    counts = {stat.view_date: stat.count for stat in recent_days}
+    today_views = counts.get(today, 0)
+    yesterday_views = counts.get(yesterday, 0)
+    week_views = sum(count for day, count in counts.items() if day >= week_ago)
+    month_views = sum(counts.values())
+    
+    daily_data = [
+        {"date": str(stat.view_date), "count": stat.count}
+        for stat in recent_days if stat.view_date >= week_ago
+    ]
     
+    page_total = func.sum(PageViewDailyPage.count)
     page_stats = db.query(
-        PageView.page,
-        func.count(PageView.id).label('count')
+        PageViewDailyPage.page,
+        page_total.label('count')
     ).group_by(
-        PageView.page
+        PageViewDailyPage.page
     ).order_by(
-        func.count(PageView.id).desc()
+        page_total.desc()
     ).limit(10).all()
     
     page_data = [{"page": stat.page, "count": stat.count} for stat in page_stats]
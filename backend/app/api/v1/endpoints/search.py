@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.core.search import SEARCH_SOURCES, search_index
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/")
+def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    if type is None:
+        kinds = list(SEARCH_SOURCES)
+    elif type in SEARCH_SOURCES:
+        kinds = [type]
+    else:
+        raise HTTPException(status_code=400, detail="无效的搜索类型")
+    return search_index.search(db, q, kinds, skip, limit)
@@ -1,23 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import json
-from app.core.database import get_db
+from app.core.bulk import run_bulk
+from app.core.cache import response_cache
+from app.core.database import get_db, get_read_db, fetch_all, fetch_first
+from app.core.http_cache import conditional_get
+from app.core.json_types import json_list_contains
+from app.core.writer import run_write
 from app.models.service import Service
 from app.models.user import User
 from app.api.v1.endpoints.auth import get_current_user
-from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from app.schemas.service import ServiceBulkRequest, ServiceCreate, ServiceUpdate, ServiceResponse
 
 router = APIRouter(prefix="/services", tags=["services"])
 
 
 def service_to_response(service: Service) -> dict:
-    features = []
-    if service.features:
-        try:
-            features = json.loads(service.features)
-        except:
-            features = []
     return {
         "id": service.id,
         "name": service.name,
@@ -25,7 +24,7 @@ def service_to_response(service: Service) -> dict:
         "description": service.description,
         "icon": service.icon,
         "image": service.image,
-        "features": features,
+        "features": service.features,
         "price_range": service.price_range,
         "duration": service.duration,
         "is_featured": service.is_featured,
@@ -35,23 +34,39 @@ def service_to_response(service: Service) -> dict:
 
 
 @router.get("/", response_model=List[ServiceResponse])
-def get_services(
+async def get_services(
+    request: Request,
     featured: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    feature: Optional[str] = None,
+    db=Depends(get_read_db)
 ):
-    query = db.query(Service)
-    if featured is not None:
-        query = query.filter(Service.is_featured == featured)
-    services = query.order_by(Service.sort_order, Service.created_at.desc()).all()
-    return [service_to_response(s) for s in services]
+    async def load():
+        query = select(Service)
+        if featured is not None:
+            query = query.where(Service.is_featured == featured)
+        if feature:
+            query = query.where(json_list_contains(Service.features, feature))
+        services = await fetch_all(db, query.order_by(Service.sort_order, Service.created_at.desc()))
+        return [service_to_response(s) for s in services]
+
+    key = response_cache.key("services:list", featured=featured, feature=feature)
+    return await conditional_get(request, "services", key, load)
 
 
 @router.get("/{service_slug}", response_model=ServiceResponse)
-def get_service(service_slug: str, db: Session = Depends(get_db)):
-    service = db.query(Service).filter(Service.slug == service_slug).first()
-    if not service:
-        raise HTTPException(status_code=404, detail="服务不存在")
-    return service_to_response(service)
+async def get_service(
+    service_slug: str,
+    request: Request,
+    db=Depends(get_read_db)
+):
+    async def load():
+        service = await fetch_first(db, select(Service).where(Service.slug == service_slug))
+        if not service:
+            raise HTTPException(status_code=404, detail="服务不存在")
+        return service_to_response(service)
+
+    key = response_cache.key("services:detail", service_slug=service_slug)
+    return await conditional_get(request, "services", key, load)
 
 
 @router.post("/", response_model=ServiceResponse)
@@ -60,20 +75,23 @@ def create_service(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    existing = db.query(Service).filter(Service.slug == service.slug).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="服务标识已存在")
-    
     service_data = service.model_dump()
-    if service_data.get("features") is not None:
-        service_data["features"] = json.dumps(service_data["features"])
-    else:
-        service_data["features"] = json.dumps([])
-    db_service = Service(**service_data)
-    db.add(db_service)
-    db.commit()
-    db.refresh(db_service)
-    return service_to_response(db_service)
+    if service_data.get("features") is None:
+        service_data["features"] = []
+
+    def write(session):
+        existing = session.query(Service).filter(Service.slug == service.slug).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="服务标识已存在")
+        db_service = Service(**service_data)
+        session.add(db_service)
+        session.flush()
+        session.refresh(db_service)
+        return service_to_response(db_service)
+
+    result = run_write(db, write)
+    response_cache.bump("services")
+    return result
 
 
 @router.put("/{service_id}", response_model=ServiceResponse)
@@ -83,27 +101,27 @@ def update_service(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_service = db.query(Service).filter(Service.id == service_id).first()
-    if not db_service:
-        raise HTTPException(status_code=404, detail="服务不存在")
-    
     update_data = service.model_dump(exclude_unset=True)
-    if "slug" in update_data and update_data["slug"] != db_service.slug:
-        existing = db.query(Service).filter(Service.slug == update_data["slug"]).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="服务标识已存在")
-    
-    if "features" in update_data:
-        if update_data["features"] is not None:
-            update_data["features"] = json.dumps(update_data["features"])
-        else:
-            update_data["features"] = json.dumps([])
-    
-    for key, value in update_data.items():
-        setattr(db_service, key, value)
-    db.commit()
-    db.refresh(db_service)
-    return service_to_response(db_service)
+    if "features" in update_data and update_data["features"] is None:
+        update_data["features"] = []
+
+    def write(session):
+        db_service = session.query(Service).filter(Service.id == service_id).first()
+        if not db_service:
+            raise HTTPException(status_code=404, detail="服务不存在")
+        if "slug" in update_data and update_data["slug"] != db_service.slug:
+            existing = session.query(Service).filter(Service.slug == update_data["slug"]).first()
+            if existing:
+                raise HTTPException(status_code=400, detail="服务标识已存在")
+        for key, value in update_data.items():
+            setattr(db_service, key, value)
+        session.flush()
+        session.refresh(db_service)
+        return service_to_response(db_service)
+
+    result = run_write(db, write)
+    response_cache.bump("services")
+    return result
 
 
 @router.delete("/{service_id}")
@@ -112,9 +130,23 @@ def delete_service(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_service = db.query(Service).filter(Service.id == service_id).first()
-    if not db_service:
-        raise HTTPException(status_code=404, detail="服务不存在")
-    db.delete(db_service)
-    db.commit()
+    def write(session):
+        db_service = session.query(Service).filter(Service.id == service_id).first()
+        if not db_service:
+            raise HTTPException(status_code=404, detail="服务不存在")
+        session.delete(db_service)
+
+    run_write(db, write)
+    response_cache.bump("services")
     return {"message": "服务已删除"}
+
+
+@router.post("/bulk")
+def bulk_services(
+    payload: ServiceBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = run_bulk(db, Service, payload, unique_fields=["slug"])
+    response_cache.bump("services", "dashboard")
+    return result
@@ -1,37 +1,110 @@
+import gzip
+import hashlib
 import os
 import uuid
-from datetime import datetime
+from typing import Optional
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.image_variants import image_variants
+from app.core.upload_storage import UPLOAD_DIR, content_path
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
-UPLOAD_DIR = "uploads"
+CHUNK_SIZE = 64 * 1024
 
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
 
+def sniff_image_type(head: bytes) -> Optional[str]:
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return ".avif"
+    if head.startswith(b"BM"):
+        return ".bmp"
+    if head.startswith(b"\x00\x00\x01\x00"):
+        return ".ico"
+    text = head[:1024].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+        return ".svg"
+    return None
+
+
+async def _remove(path: str):
+    try:
+        await anyio.to_thread.run_sync(os.remove, path)
+    except FileNotFoundError:
+        pass
+
+
+def _store(tmp_path: str, filename: str):
+    final_path = os.path.join(UPLOAD_DIR, filename)
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+    if final_path.endswith(".svg"):
+        with open(final_path, "rb") as src, open(final_path + ".gz.tmp", "wb") as dst:
+            dst.write(gzip.compress(src.read(), compresslevel=9, mtime=0))
+        os.replace(final_path + ".gz.tmp", final_path + ".gz")
+
+
+async def save_upload(file: UploadFile) -> str:
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="只能上传图片文件")
+
+    tmp_path = os.path.join(UPLOAD_DIR, f".tmp-{uuid.uuid4().hex}")
+    ext = None
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if ext is None:
+                    ext = sniff_image_type(chunk)
+                    if ext is None:
+                        raise HTTPException(status_code=400, detail="只能上传图片文件")
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_SIZE:
+                    raise HTTPException(status_code=413, detail="文件过大")
+                digest.update(chunk)
+                await out.write(chunk)
+        if ext is None:
+            raise HTTPException(status_code=400, detail="文件内容为空")
+
+        filename = content_path(digest.hexdigest(), ext)
+        await anyio.to_thread.run_sync(_store, tmp_path, filename)
+    except BaseException:
+        await _remove(tmp_path)
+        raise
+
+    return filename
+
+
 @router.post("/image")
 async def upload_image(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="只能上传图片文件")
-    
-    ext = os.path.splitext(file.filename)[1] if file.filename else ".jpg"
-    filename = f"{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex[:8]}{ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
-    content = await file.read()
-    with open(filepath, "wb") as f:
-        f.write(content)
-    
-    return {"url": f"/uploads/{filename}"}
+    filename = await save_upload(file)
+    variants = await anyio.to_thread.run_sync(image_variants.schedule, filename)
+    return {"url": f"/uploads/{filename}", "variants": variants}
 
 
 @router.post("/images")
@@ -40,18 +113,19 @@ async def upload_images(
     current_user: User = Depends(get_current_user)
 ):
     urls = []
+    variants = {}
     for file in files:
-        if not file.content_type or not file.content_type.startswith("image/"):
+        try:
+            filename = await save_upload(file)
+        except HTTPException:
             continue
-        
-        ext = os.path.splitext(file.filename)[1] if file.filename else ".jpg"
-        filename = f"{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex[:8]}{ext}"
-        filepath = os.path.join(UPLOAD_DIR, filename)
-        
-        content = await file.read()
-        with open(filepath, "wb") as f:
-            f.write(content)
-        
-        urls.append(f"/uploads/{filename}")
+        url = f"/uploads/{filename}"
+        urls.append(url)
+        variants[url] = await anyio.to_thread.run_sync(image_variants.schedule, filename)
     
-    return {"urls": urls}
+    return {"urls": urls, "variants": variants}
+
+
+@router.get("/variant-stats")
+def get_variant_stats(current_user: User = Depends(get_current_user)):
+    return image_variants.stats()
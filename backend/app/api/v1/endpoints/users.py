@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List
+from app.core.auth_cache import auth_cache
 from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.core.security import password_hasher
+from app.core.writer import run_write
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
@@ -36,7 +39,7 @@ def get_user(
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -45,6 +48,17 @@ def update_user(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="权限不足")
     
+    hashed_password = None
+    if user_update.password:
+        hashed_password = await password_hasher.hash(user_update.password)
+    result = await run_in_threadpool(
+        run_write, db, lambda session: _apply_user_update(session, user_id, user_update, hashed_password)
+    )
+    auth_cache.invalidate_user(user_id)
+    return result
+
+
+def _apply_user_update(db: Session, user_id: int, user_update: UserUpdate, hashed_password: str = None):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
@@ -67,12 +81,12 @@ def update_user(
     if user_update.is_active is not None:
         user.is_active = user_update.is_active
     
-    if user_update.password:
-        user.hashed_password = get_password_hash(user_update.password)
+    if hashed_password:
+        user.hashed_password = hashed_password
     
-    db.commit()
+    db.flush()
     db.refresh(user)
-    return user
+    return UserResponse.model_validate(user)
 
 
 @router.delete("/{user_id}")
@@ -84,13 +98,16 @@ def delete_user(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="权限不足")
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="用户不存在")
-    
-    if user.username == "admin":
-        raise HTTPException(status_code=400, detail="不能删除管理员账号")
-    
-    db.delete(user)
-    db.commit()
+    def write(session):
+        user = session.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="用户不存在")
+        
+        if user.username == "admin":
+            raise HTTPException(status_code=400, detail="不能删除管理员账号")
+        
+        session.delete(user)
+
+    run_write(db, write)
+    auth_cache.invalidate_user(user_id)
     return {"message": "删除成功"}
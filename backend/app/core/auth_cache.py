@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from app.core.config import settings
+from app.models.user import User
+
+USER_FIELDS = ("id", "username", "email", "hashed_password", "is_active", "is_superuser", "created_at", "updated_at")
+
+
+class AuthCache:
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._tokens = OrderedDict()
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+        self.token_hits = 0
+        self.token_misses = 0
+        self.user_hits = 0
+        self.user_misses = 0
+        self.invalidations = 0
+        self.lookups = 0
+        self.total_lookup_ms = 0.0
+        self.max_lookup_ms = 0.0
+
+    def _get(self, entries: OrderedDict, key):
+        item = entries.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return value
+
+    def _set(self, entries: OrderedDict, key, value, ttl: float):
+        entries[key] = (value, time.monotonic() + ttl)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def get_token(self, token: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            user_id = self._get(self._tokens, token)
+            if user_id is None:
+                self.token_misses += 1
+            else:
+                self.token_hits += 1
+            return user_id
+
+    def set_token(self, token: str, user_id: int, expires_at=None):
+        if not self.enabled:
+            return
+        ttl = self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, float(expires_at) - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._set(self._tokens, token, user_id, ttl)
+
+    def get_user(self, user_id: int):
+        if not self.enabled:
+            return None
+        with self._lock:
+            snapshot = self._get(self._users, user_id)
+            if snapshot is None:
+                self.user_misses += 1
+                return None
+            self.user_hits += 1
+        return User(**snapshot)
+
+    def set_user(self, user: User):
+        if not self.enabled:
+            return
+        snapshot = {field: getattr(user, field) for field in USER_FIELDS}
+        with self._lock:
+            self._set(self._users, user.id, snapshot, self.ttl)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            if self._users.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def record_lookup(self, elapsed_ms: float):
+        self.lookups += 1
+        self.total_lookup_ms += elapsed_ms
+        self.max_lookup_ms = max(self.max_lookup_ms, elapsed_ms)
+
+    def stats(self) -> dict:
+        user_lookups = self.user_hits + self.user_misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "token_hits": self.token_hits,
+            "token_misses": self.token_misses,
+            "user_hits": self.user_hits,
+            "user_misses": self.user_misses,
+            "hit_ratio": round(self.user_hits / user_lookups, 4) if user_lookups else 0.0,
+            "invalidations": self.invalidations,
+            "lookups": self.lookups,
+            "avg_lookup_ms": round(self.total_lookup_ms / self.lookups, 3) if self.lookups else 0.0,
+            "max_lookup_ms": round(self.max_lookup_ms, 3),
+        }
+
+
+auth_cache = AuthCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL,
+    enabled=settings.AUTH_CACHE_ENABLED,
+)
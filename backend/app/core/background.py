@@ -0,0 +1,98 @@
+import threading
+import time
+
+
+class BackgroundFlusher:
+    # 子类实现 pending 与 _flush_once，并用 self._cond 保护自身缓冲区；
+    # _flush_once 每次最多处理 batch_size 条，保证单次刷新耗时有界。
+
+    def __init__(self, name: str, interval: float, batch_size: int):
+        self.name = name
+        self.interval = interval
+        self.batch_size = batch_size
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        self.flush_count = 0
+        self.flushed_items = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def pending(self) -> int:
+        raise NotImplementedError
+
+    def _flush_once(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.drain()
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def drain(self):
+        while self.pending():
+            if not self.flush():
+                break
+
+    def flush(self):
+        start = time.perf_counter()
+        try:
+            count = self._flush_once()
+        except Exception as e:
+            self.flush_errors += 1
+            print(f"{self.name} 刷新失败: {e}")
+            return None
+        if count:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flush_count += 1
+            self.flushed_items += count
+            self.last_flush_ms = elapsed_ms
+            self.total_flush_ms += elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        return count
+
+    def _run(self):
+        failed = False
+        while True:
+            with self._cond:
+                if not self._stopping and (failed or self.pending() < self.batch_size):
+                    self._cond.wait(self.interval)
+                if self._stopping:
+                    return
+            failed = self.flush() is None
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "pending": self.pending(),
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval,
+            "flush_count": self.flush_count,
+            "flushed_items": self.flushed_items,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.flush_count, 3) if self.flush_count else 0.0,
+        }
@@ -0,0 +1,40 @@
+from fastapi import HTTPException
+from app.core.responses import FastJSONResponse
+
+
+class BodySizeLimitMiddleware:
+    # 在 FastAPI 解析 multipart 之前限制请求体大小，超限的上传不会再被完整读入临时文件
+    def __init__(self, app, path_prefix: str, max_size: int):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = None
+                if declared is not None and declared > self.max_size:
+                    response = FastJSONResponse({"detail": "文件过大"}, status_code=413)
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise HTTPException(status_code=413, detail="文件过大")
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,108 @@
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.search import search_index
+from app.core.writer import run_write
+
+
+def _check_unique(db: Session, model, field: str, payload, errors: list):
+    column = getattr(model, field)
+    claimed = {}
+    for index, item in enumerate(payload.create):
+        value = getattr(item, field)
+        if value in claimed:
+            errors.append({"op": "create", "index": index, "detail": f"{field} 在本次请求中重复: {value}"})
+        claimed[value] = None
+    for index, item in enumerate(payload.update):
+        if field not in item.model_fields_set or getattr(item, field) is None:
+            continue
+        value = getattr(item, field)
+        if len(item.ids) > 1:
+            errors.append({"op": "update", "index": index, "detail": f"不能将同一个 {field} 批量设置给多条记录"})
+        elif value in claimed:
+            errors.append({"op": "update", "index": index, "detail": f"{field} 在本次请求中重复: {value}"})
+        else:
+            claimed[value] = item.ids[0]
+    if not claimed:
+        return
+    deleted = set(payload.delete)
+    rows = db.execute(select(model.id, column).where(column.in_(list(claimed)))).all()
+    for row_id, value in rows:
+        if row_id in deleted or claimed[value] == row_id:
+            continue
+        errors.append({"op": "create" if claimed[value] is None else "update", "value": value, "detail": f"{field} 已存在: {value}"})
+
+
+def apply_bulk(db: Session, model, payload, unique_fields: List[str] = ()) -> dict:
+    total = len(payload.create) + sum(len(item.ids) for item in payload.update) + len(payload.delete)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="没有需要执行的操作")
+    if total > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"单次批量操作最多 {settings.BULK_MAX_ITEMS} 条")
+
+    errors = []
+    referenced = {row_id for item in payload.update for row_id in item.ids} | set(payload.delete)
+    existing = set()
+    if referenced:
+        existing = set(db.scalars(select(model.id).where(model.id.in_(referenced))))
+    updates = []
+    for index, item in enumerate(payload.update):
+        values = item.model_dump(exclude_unset=True, exclude={"ids"})
+        missing = [row_id for row_id in item.ids if row_id not in existing]
+        if not item.ids:
+            errors.append({"op": "update", "index": index, "detail": "ids 不能为空"})
+        elif missing:
+            errors.append({"op": "update", "index": index, "detail": "记录不存在", "ids": missing})
+        elif not values:
+            errors.append({"op": "update", "index": index, "detail": "没有需要更新的字段"})
+        updates.append(values)
+    missing = [row_id for row_id in payload.delete if row_id not in existing]
+    if missing:
+        errors.append({"op": "delete", "detail": "记录不存在", "ids": missing})
+    for field in unique_fields:
+        _check_unique(db, model, field, payload, errors)
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "批量操作未执行", "errors": errors})
+
+    result = {"created": [], "updated": [], "deleted": {"ids": list(payload.delete), "count": 0}}
+    if payload.create:
+        rows = [item.model_dump() for item in payload.create]
+        ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+        result["created"] = [{"index": index, "id": row_id} for index, row_id in enumerate(ids)]
+
+    by_id = []
+    for index, (item, values) in enumerate(zip(payload.update, updates)):
+        if len(item.ids) == 1:
+            by_id.append({"id": item.ids[0], **values})
+        else:
+            db.execute(
+                update(model).where(model.id.in_(item.ids)).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        result["updated"].append({"index": index, "ids": item.ids, "count": len(item.ids)})
+    if by_id:
+        db.execute(update(model), by_id)
+
+    if payload.delete:
+        deleted = db.execute(
+            delete(model).where(model.id.in_(payload.delete)).execution_options(synchronize_session=False)
+        )
+        result["deleted"]["count"] = deleted.rowcount
+
+    changed = [row["id"] for row in result["created"]] + sorted(
+        {row_id for item in payload.update for row_id in item.ids} | set(payload.delete)
+    )
+    search_index.sync_rows(db, model, changed)
+    return result
+
+
+def run_bulk(db: Session, model, payload, unique_fields: List[str] = ()) -> dict:
+    # 校验和写入放在同一个写入单元里，出错时整批回滚到保存点
+    try:
+        return run_write(db, lambda session: apply_bulk(session, model, payload, unique_fields))
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail={"message": "批量操作未执行", "errors": [{"detail": str(e.orig)}]})
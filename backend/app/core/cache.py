@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from app.core.config import settings
+from app.core.responses import dumps
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class CacheEntry:
+    __slots__ = ("value", "version", "expires_at", "body", "etag", "last_modified")
+
+    def __init__(self, value, version: int, expires_at: float, last_modified: float):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+        self.body = dumps(value)
+        self.etag = compute_etag(self.body)
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._modified_at = {}
+        self._started_at = int(time.time())
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(route: str, **params) -> tuple:
+        return (route, tuple(sorted((k, v) for k, v in params.items() if v is not None)))
+
+    def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def modified_at(self, namespace: str) -> int:
+        return self._modified_at.get(namespace, self._started_at)
+
+    def bump(self, *namespaces: str):
+        now = int(time.time())
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+                self._modified_at[namespace] = now
+
+    def get_entry(self, namespace: str, key: tuple):
+        if not self.enabled:
+            return None
+        cache_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.version != self._versions.get(namespace, 0):
+                del self._entries[cache_key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[cache_key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
+
+    def set_entry(self, namespace: str, key: tuple, value, version: int, ttl: float = None) -> CacheEntry:
+        ttl = self.ttl if ttl is None else ttl
+        entry = CacheEntry(value, version, time.monotonic() + ttl, self.modified_at(namespace))
+        if not self.enabled:
+            return entry
+        cache_key = (namespace, key)
+        with self._lock:
+            if version != self._versions.get(namespace, 0):
+                return entry
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def get_or_load_entry(self, namespace: str, key: tuple, loader, ttl: float = None) -> CacheEntry:
+        version = self.version(namespace)
+        entry = self.get_entry(namespace, key)
+        if entry is not None:
+            return entry
+        return self.set_entry(namespace, key, loader(), version, ttl)
+
+    async def get_or_load_entry_async(self, namespace: str, key: tuple, loader, ttl: float = None) -> CacheEntry:
+        version = self.version(namespace)
+        entry = self.get_entry(namespace, key)
+        if entry is not None:
+            return entry
+        return self.set_entry(namespace, key, await loader(), version, ttl)
+
+    def get_or_load(self, namespace: str, key: tuple, loader, ttl: float = None):
+        return self.get_or_load_entry(namespace, key, loader, ttl).value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "versions": dict(self._versions),
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
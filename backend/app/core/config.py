@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import json
 
 
@@ -7,8 +7,21 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "宜然焕新官网"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    DEBUG: bool = False
     
     DATABASE_URL: str = "sqlite:///./data/yiran_huanxin.db"
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -64000
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    SQLITE_TEMP_STORE: str = "MEMORY"
     
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -21,6 +34,59 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    AUTH_CACHE_TTL: float = 60.0
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    PAGE_VIEW_BUFFER_ENABLED: bool = True
+    PAGE_VIEW_BUFFER_MAX_SIZE: int = 10000
+    PAGE_VIEW_FLUSH_BATCH_SIZE: int = 500
+    PAGE_VIEW_FLUSH_INTERVAL: float = 2.0
+
+    WRITE_QUEUE_ENABLED: bool = True
+    WRITE_QUEUE_BATCH_SIZE: int = 64
+    WRITE_QUEUE_INTERVAL: float = 0.5
+    WRITE_QUEUE_TIMEOUT: float = 30.0
+    WRITE_QUEUE_MAX_PENDING: int = 1000
+
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+    SQL_STATS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    RATE_LIMIT_ENABLED: bool = True
+    TRUSTED_PROXIES: List[str] = []
+    RATE_LIMIT_MAX_KEYS: int = 10000
+    CONTACT_RATE_LIMIT: float = 0.1
+    CONTACT_RATE_BURST: int = 5
+    PAGE_VIEW_RATE_LIMIT: float = 2.0
+    PAGE_VIEW_RATE_BURST: int = 30
+
+    NEWS_VIEW_FLUSH_BATCH_SIZE: int = 200
+    NEWS_VIEW_FLUSH_INTERVAL: float = 5.0
+    NEWS_VIEW_CACHE_REFRESH: float = 60.0
+
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL: float = 60.0
+    HTTP_CACHE_POLICIES: Dict[str, str] = {}
+    DASHBOARD_CACHE_TTL: float = 10.0
+
+    BULK_MAX_ITEMS: int = 1000
+
+    UPLOAD_MAX_SIZE: int = 10 * 1024 * 1024
+    UPLOAD_MAX_REQUEST_SIZE: int = 50 * 1024 * 1024
+    UPLOAD_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    UPLOAD_CACHE_MAX_FILE_SIZE: int = 512 * 1024
+    IMAGE_VARIANTS_ENABLED: bool = True
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1280]
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_VARIANT_WORKERS: int = 2
 
     class Config:
         env_file = ".env"
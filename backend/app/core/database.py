@@ -1,18 +1,93 @@
-from sqlalchemy import create_engine
+import json
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 
+SQLITE_PRAGMAS = {
+    "journal_mode": settings.SQLITE_JOURNAL_MODE,
+    "synchronous": settings.SQLITE_SYNCHRONOUS,
+    "mmap_size": settings.SQLITE_MMAP_SIZE,
+    "cache_size": settings.SQLITE_CACHE_SIZE,
+    "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+    "temp_store": settings.SQLITE_TEMP_STORE,
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def json_serializer(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def engine_options(url: str, poolclass=QueuePool) -> dict:
+    options = {"json_serializer": json_serializer}
+    if is_sqlite(url) and ":memory:" in url:
+        return options
+    # 旧版 SQLAlchemy 对文件型 SQLite（含 aiosqlite）默认用 NullPool，不接受下面的池参数，这里显式指定池类型
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False} if is_sqlite(settings.DATABASE_URL) else {},
+    **engine_options(settings.DATABASE_URL)
 )
 
+if is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+def get_async_database_url(url: str) -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgres:"):
+        return url.replace("postgres:", "postgresql+asyncpg:", 1)
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+AsyncSession = None
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_database_url = get_async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_database_url, **engine_options(async_database_url, AsyncAdaptedQueuePool)
+    )
+    if is_sqlite(async_database_url):
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -21,6 +96,61 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_read_db = get_async_db if settings.ASYNC_DB_ENABLED else get_db
+
+
+def is_async_session(db) -> bool:
+    return AsyncSession is not None and isinstance(db, AsyncSession)
+
+
+async def fetch_all(db, statement) -> list:
+    if is_async_session(db):
+        result = await db.execute(statement)
+        return result.scalars().all()
+    return await run_in_threadpool(lambda: db.execute(statement).scalars().all())
+
+
+async def fetch_first(db, statement):
+    if is_async_session(db):
+        result = await db.execute(statement)
+        return result.scalars().first()
+    return await run_in_threadpool(lambda: db.execute(statement).scalars().first())
+
+
+async def save(db, instance):
+    db.add(instance)
+    if is_async_session(db):
+        await db.commit()
+        await db.refresh(instance)
+        return instance
+
+    def commit():
+        db.commit()
+        db.refresh(instance)
+    await run_in_threadpool(commit)
+    return instance
+
+
+def get_database_status() -> dict:
+    status = {
+        "dialect": engine.dialect.name,
+        "pool": engine.pool.status(),
+        "async_enabled": async_engine is not None,
+    }
+    if is_sqlite(settings.DATABASE_URL):
+        with engine.connect() as connection:
+            status["pragmas"] = {
+                pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                for pragma in SQLITE_PRAGMAS
+            }
+    return status
+
+
 def init_db():
     from app.models.user import User
     from app.models.news import News
@@ -28,6 +158,9 @@ def init_db():
     from app.models.contact import Contact
     from app.models.company import Company
     from app.models.service import Service
-    from app.models.page_view import PageView
+    from app.models.page_view import PageView, PageViewDaily, PageViewDailyPage
     
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
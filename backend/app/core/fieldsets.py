@@ -0,0 +1,20 @@
+from typing import Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only
+
+REQUIRED_FIELDS = ("id", "created_at")
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[tuple]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    invalid = sorted(requested - set(allowed))
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"无效的字段: {', '.join(invalid)}")
+    requested.update(REQUIRED_FIELDS)
+    return tuple(f for f in allowed if f in requested)
+
+
+def load_only_fields(model, fields: Sequence[str]):
+    return load_only(*[getattr(model, f) for f in fields])
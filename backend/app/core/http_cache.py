@@ -0,0 +1,55 @@
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.responses import trusted_json
+
+# 后台保存后会立刻重新拉取这些公开接口，带 max-age 会让浏览器或代理返回旧列表；
+# 默认每次都向后端验证，ETag 命中时只回 304，开销很小。
+# 需要更长缓存的路由可通过 HTTP_CACHE_POLICIES 单独配置，但不要用于后台会重新拉取的接口。
+DEFAULT_CACHE_POLICY = "no-cache"
+
+
+def cache_policy(route: str) -> str:
+    return settings.HTTP_CACHE_POLICIES.get(route) or DEFAULT_CACHE_POLICY
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: int) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None:
+        return False
+    return last_modified <= int(since.timestamp())
+
+
+def is_not_modified(request: Request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+async def conditional_get(
+    request: Request, namespace: str, key: tuple, loader, extra_headers=None, ttl: float = None
+) -> Response:
+    entry = await response_cache.get_or_load_entry_async(namespace, key, loader, ttl)
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": cache_policy(key[0]),
+    }
+    if extra_headers is not None:
+        headers.update(extra_headers(entry.value))
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    return trusted_json(entry.body, headers=headers)
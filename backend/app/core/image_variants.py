@@ -0,0 +1,169 @@
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from app.core.config import settings
+from app.core.upload_storage import UPLOAD_DIR
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+VARIANT_SOURCE_EXTS = {".jpg", ".png", ".webp", ".bmp", ".avif"}
+
+
+def variant_name(filename: str, width: int) -> str:
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}_{width}w.webp"
+
+
+def manifest_name(filename: str) -> str:
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}.manifest.json"
+
+
+def read_image_size(path: str):
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def plan_widths(size, widths: List[int]) -> List[int]:
+    if not size:
+        return []
+    return sorted(w for w in set(widths) if 0 < w < size[0])
+
+
+def generate_variants(upload_dir: str, filename: str, widths: List[int], quality: int) -> dict:
+    source = os.path.join(upload_dir, filename)
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        variants = []
+        for width in widths:
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.LANCZOS)
+            name = variant_name(filename, width)
+            head, tail = os.path.split(name)
+            tmp_path = os.path.join(upload_dir, head, f".tmp-{os.getpid()}-{tail}")
+            resized.save(tmp_path, "WEBP", quality=quality, method=4)
+            os.replace(tmp_path, os.path.join(upload_dir, name))
+            variants.append({
+                "width": width,
+                "height": height,
+                "url": f"/uploads/{name}",
+                "bytes": os.path.getsize(os.path.join(upload_dir, name)),
+            })
+        manifest = {
+            "original": {
+                "url": f"/uploads/{filename}",
+                "width": img.width,
+                "height": img.height,
+                "bytes": os.path.getsize(source),
+            },
+            "variants": variants,
+        }
+    path = os.path.join(upload_dir, manifest_name(filename))
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    return manifest
+
+
+class ImageVariantPipeline:
+    def __init__(self, upload_dir: str, widths: List[int], quality: int, workers: int, enabled: bool = True):
+        self.upload_dir = upload_dir
+        self.widths = widths
+        self.quality = quality
+        self.workers = workers
+        self.enabled = enabled and Image is not None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 服务进程里有写入、刷新等后台线程，fork 时若它们正持有锁，子进程会死锁；改用 spawn
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def plan(self, filename: str) -> List[dict]:
+        if not self.enabled or os.path.splitext(filename)[1] not in VARIANT_SOURCE_EXTS:
+            return []
+        size = read_image_size(os.path.join(self.upload_dir, filename))
+        return [
+            {"width": width, "url": f"/uploads/{variant_name(filename, width)}"}
+            for width in plan_widths(size, self.widths)
+        ]
+
+    def submit(self, filename: str, variants: List[dict]):
+        if not variants:
+            return None
+        with self._lock:
+            if filename in self._inflight:
+                return None
+            self._inflight.add(filename)
+        widths = [v["width"] for v in variants]
+        future = self._get_executor().submit(
+            generate_variants, self.upload_dir, filename, widths, self.quality
+        )
+        self.submitted += 1
+        future.add_done_callback(lambda f: self._on_done(filename, f))
+        return future
+
+    def schedule(self, filename: str) -> List[dict]:
+        variants = self.plan(filename)
+        if not os.path.exists(os.path.join(self.upload_dir, manifest_name(filename))):
+            self.submit(filename, variants)
+        return variants
+
+    def _on_done(self, filename: str, future):
+        with self._lock:
+            self._inflight.discard(filename)
+        error = future.exception()
+        if error is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+            print(f"图片变体生成失败 {filename}: {error}")
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pillow_available": Image is not None,
+            "widths": self.widths,
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.submitted - self.completed - self.failed,
+        }
+
+
+image_variants = ImageVariantPipeline(
+    upload_dir=UPLOAD_DIR,
+    widths=settings.IMAGE_VARIANT_WIDTHS,
+    quality=settings.IMAGE_VARIANT_QUALITY,
+    workers=settings.IMAGE_VARIANT_WORKERS,
+    enabled=settings.IMAGE_VARIANTS_ENABLED,
+)
@@ -0,0 +1,66 @@
+import json
+from sqlalchemy import JSON, exists, func, inspect, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeDecorator
+from app.core.config import settings
+from app.core.database import is_sqlite
+
+
+class JSONList(TypeDecorator):
+    impl = JSON(none_as_null=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            value = parse_json_list(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return value if isinstance(value, list) else []
+
+
+def parse_json_list(value) -> list:
+    try:
+        value = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return value if isinstance(value, list) else []
+
+
+def json_list_contains(column, value):
+    if is_sqlite(settings.DATABASE_URL):
+        elements = func.json_each(column).table_valued("value")
+    else:
+        elements = func.json_array_elements_text(column).table_valued("value")
+    return exists(select(1).select_from(elements).where(elements.c.value == value))
+
+
+def migrate_json_columns(db: Session) -> int:
+    from app.models.news import News
+    from app.models.case import Case
+    from app.models.service import Service
+    from app.models.company import Company
+
+    fixed = 0
+    bind = db.get_bind()
+    for model in (News, Case, Service, Company):
+        table = model.__tablename__
+        columns = [c.name for c in model.__table__.columns if isinstance(c.type, JSONList)]
+        for column in columns:
+            rows = db.execute(text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all()
+            for row_id, raw in rows:
+                if isinstance(raw, list):
+                    continue
+                normalized = json.dumps(parse_json_list(raw), ensure_ascii=False)
+                if raw != normalized:
+                    db.execute(
+                        text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+                        {"value": normalized, "id": row_id},
+                    )
+                    fixed += 1
+            if bind.dialect.name == "postgresql":
+                current = {c["name"]: c["type"] for c in inspect(bind).get_columns(table)}
+                if not isinstance(current.get(column), JSON):
+                    db.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json"))
+    db.commit()
+    return fixed
@@ -0,0 +1,292 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+import anyio.to_thread
+from sqlalchemy import event
+from app.core.auth_cache import auth_cache
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.page_view_buffer import page_view_buffer
+from app.core.query_stats import query_totals
+from app.core.rate_limit import rate_limiter
+from app.core.security import password_hasher
+from app.core.upload_server import upload_server
+from app.core.writer import write_queue
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values, amount: float = 1):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in items)
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(counts), total) for key, (counts, total) in self._series.items())
+        names = self.labels + ("le",)
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(names, key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+def sample_lines(name: str, kind: str, help: str, samples: Dict[Tuple, float], labels: Tuple[str, ...] = ()) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels, key)} {_number(value)}" for key, value in samples.items())
+    return lines
+
+
+class Metrics:
+    def __init__(self):
+        self.requests = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+        self.latency = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+        self.pool_checkout = Histogram(
+            "db_pool_checkout_seconds", "Time spent acquiring a pooled DB connection", buckets=POOL_BUCKETS
+        )
+        self.pool_held = Histogram(
+            "db_pool_connection_held_seconds", "Time a DB connection stays checked out", buckets=POOL_BUCKETS
+        )
+        self.pool_connects = Counter("db_pool_connections_created_total", "New DBAPI connections opened by the pool")
+        self.in_flight = 0
+        self._collectors = []
+
+    def collector(self, fn):
+        self._collectors.append(fn)
+        return fn
+
+    def instrument_engine(self, engine):
+        waiting = threading.local()
+
+        # 池只有拿到连接之后的 checkout 事件，没有“开始等待”的事件；在公开的 pool.connect()
+        # 入口记下开始时间，到 checkout 事件时得出排队等待的耗时。
+        def time_pool(pool):
+            connect = getattr(pool, "connect", None)
+            if not callable(connect) or getattr(connect, "timed", False):
+                return
+
+            def timed_connect():
+                waiting.started = time.perf_counter()
+                try:
+                    return connect()
+                finally:
+                    # 正常情况下 checkout 事件已经取走开始时间，剩下的是超时或连接失败
+                    started = waiting.__dict__.pop("started", None)
+                    if started is not None:
+                        self.pool_checkout.observe(time.perf_counter() - started)
+
+            timed_connect.timed = True
+            pool.connect = timed_connect
+
+        time_pool(engine.pool)
+
+        @event.listens_for(engine, "engine_disposed")
+        def on_disposed(engine):
+            time_pool(engine.pool)
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.pool_connects.inc()
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            now = time.perf_counter()
+            started = waiting.__dict__.pop("started", None)
+            if started is not None:
+                self.pool_checkout.observe(now - started)
+            connection_record.info["checked_out_at"] = now
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checked_out_at", None)
+            if started is not None:
+                self.pool_held.observe(time.perf_counter() - started)
+
+    def render(self) -> bytes:
+        lines = sample_lines("http_requests_in_flight", "gauge", "Requests currently being served", {(): self.in_flight})
+        for metric in (self.requests, self.latency, self.pool_checkout, self.pool_held, self.pool_connects):
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            try:
+                lines.extend(collect())
+            except Exception as e:
+                print(f"指标采集失败 {getattr(collect, '__name__', collect)}: {e}")
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+metrics = Metrics()
+metrics.instrument_engine(engine)
+
+
+@metrics.collector
+def runtime_metrics() -> List[str]:
+    limiter = anyio.to_thread.current_default_thread_limiter().statistics()
+    pool = engine.pool
+    lines = sample_lines("threadpool_threads", "gauge", "Worker threads used by sync endpoints", {
+        ("busy",): limiter.borrowed_tokens,
+        ("limit",): limiter.total_tokens,
+        ("waiting",): limiter.tasks_waiting,
+    }, ("state",))
+    if hasattr(pool, "checkedout"):
+        lines += sample_lines("db_pool_connections", "gauge", "DB connection pool state", {
+            ("checked_out",): pool.checkedout(),
+            ("idle",): pool.checkedin(),
+            ("overflow",): max(pool.overflow(), 0),
+            ("size",): pool.size(),
+        }, ("state",))
+    lines += sample_lines("background_queue_depth", "gauge", "Items waiting in background writers", {
+        ("write_queue",): write_queue.pending(),
+        ("page_views",): page_view_buffer.pending(),
+        ("password_hash",): password_hasher.in_flight,
+    }, ("queue",))
+    return lines
+
+
+@metrics.collector
+def cache_metrics() -> List[str]:
+    response = response_cache.stats()
+    auth = auth_cache.stats()
+    uploads = upload_server.stats()
+    counts = {
+        "response": (response["hits"], response["misses"]),
+        "auth_token": (auth["token_hits"], auth["token_misses"]),
+        "auth_user": (auth["user_hits"], auth["user_misses"]),
+        "uploads": (uploads["hits"], uploads["misses"]),
+    }
+    lines = sample_lines("cache_hits_total", "counter", "Cache hits", {(k,): v[0] for k, v in counts.items()}, ("cache",))
+    lines += sample_lines("cache_misses_total", "counter", "Cache misses", {(k,): v[1] for k, v in counts.items()}, ("cache",))
+    lines += sample_lines("cache_hit_ratio", "gauge", "Cache hit ratio since start", {
+        (k,): round(hits / (hits + misses), 4) if hits + misses else 0.0 for k, (hits, misses) in counts.items()
+    }, ("cache",))
+    return lines
+
+
+@metrics.collector
+def query_metrics() -> List[str]:
+    stats = query_totals.stats()
+    lines = sample_lines("db_queries_total", "counter", "SQL statements executed", {(): stats["queries"]})
+    lines += sample_lines("db_query_seconds_total", "counter", "Time spent executing SQL", {(): stats["total_ms"] / 1000})
+    lines += sample_lines("db_slow_queries_total", "counter", "SQL statements over SLOW_QUERY_MS", {(): stats["slow_queries"]})
+    lines += sample_lines(
+        "db_n_plus_one_warnings_total", "counter", "Requests repeating one SELECT N_PLUS_ONE_THRESHOLD times",
+        {(): stats["n_plus_one_warnings"]},
+    )
+    return lines
+
+
+@metrics.collector
+def rate_limit_metrics() -> List[str]:
+    stats = rate_limiter.stats()
+    samples = {}
+    for outcome in ("allowed", "limited", "shed"):
+        for route, count in stats[outcome].items():
+            samples[(route, outcome)] = count
+    return sample_lines("rate_limit_requests_total", "counter", "Rate limiter decisions", samples, ("route", "outcome"))
+
+
+def route_label(scope) -> str:
+    if "endpoint" not in scope:
+        return "unmatched"
+    app_root_path = scope.get("app_root_path")
+    if app_root_path is not None and scope.get("root_path", "") != app_root_path:
+        return scope["root_path"][len(app_root_path):] + "/{path}"
+    # 路由模板在不同 FastAPI 版本里的位置不一样，这里用路径参数把实际路径还原成模板，
+    # 保证指标标签的数量只和路由数量相关。
+    params = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    segments = scope["path"].split("/")
+    for i in range(len(segments) - 1, -1, -1):
+        if not params:
+            break
+        name = params.pop(segments[i], None)
+        if name is not None:
+            segments[i] = "{" + name + "}"
+    return "/".join(segments)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            route = route_label(scope)
+            method = scope["method"]
+            metrics.requests.inc(method, route, status)
+            metrics.latency.observe(elapsed, method, route)
@@ -0,0 +1,67 @@
+from collections import deque
+from sqlalchemy import insert
+from app.core.background import BackgroundFlusher
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.page_view_rollup import apply_page_views
+from app.models.page_view import PageView
+
+
+class PageViewBuffer(BackgroundFlusher):
+    def __init__(self, max_size: int, batch_size: int, interval: float):
+        super().__init__("page-view-buffer", interval, batch_size)
+        self.max_size = max_size
+        self._queue = deque()
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, row: dict) -> bool:
+        with self._cond:
+            if len(self._queue) >= self.max_size:
+                self.dropped += 1
+                return False
+            self._queue.append(row)
+            self.enqueued += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _flush_once(self) -> int:
+        with self._cond:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        if not batch:
+            return 0
+        db = SessionLocal()
+        try:
+            db.execute(insert(PageView), batch)
+            apply_page_views(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._cond:
+                self._queue.extendleft(reversed(batch))
+            raise
+        finally:
+            db.close()
+        return len(batch)
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data.update({
+            "enabled": settings.PAGE_VIEW_BUFFER_ENABLED,
+            "queue_depth": data["pending"],
+            "max_size": self.max_size,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+        })
+        return data
+
+
+page_view_buffer = PageViewBuffer(
+    max_size=settings.PAGE_VIEW_BUFFER_MAX_SIZE,
+    batch_size=settings.PAGE_VIEW_FLUSH_BATCH_SIZE,
+    interval=settings.PAGE_VIEW_FLUSH_INTERVAL,
+)
@@ -0,0 +1,74 @@
+from collections import Counter
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.page_view import PageView, PageViewDaily, PageViewDailyPage
+
+
+def _upsert_counts(db: Session, model, key_columns: list, rows: list):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={"count": model.count + stmt.excluded.count},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        conditions = [getattr(model, key) == row[key] for key in key_columns]
+        result = db.execute(update(model).where(*conditions).values(count=model.count + row["count"]))
+        if result.rowcount == 0:
+            db.execute(insert(model).values(**row))
+
+
+def apply_page_views(db: Session, rows: list):
+    if not rows:
+        return
+    daily = Counter(row["view_date"] for row in rows)
+    daily_pages = Counter((row["view_date"], row["page"]) for row in rows)
+    _upsert_counts(
+        db, PageViewDaily, ["view_date"],
+        [{"view_date": d, "count": n} for d, n in daily.items()],
+    )
+    _upsert_counts(
+        db, PageViewDailyPage, ["view_date", "page"],
+        [{"view_date": d, "page": p, "count": n} for (d, p), n in daily_pages.items()],
+    )
+
+
+def rebuild_page_view_rollups(db: Session):
+    db.execute(delete(PageViewDailyPage))
+    db.execute(delete(PageViewDaily))
+    db.execute(
+        insert(PageViewDaily).from_select(
+            ["view_date", "count"],
+            select(PageView.view_date, func.count(PageView.id))
+            .where(PageView.view_date.isnot(None))
+            .group_by(PageView.view_date),
+        )
+    )
+    db.execute(
+        insert(PageViewDailyPage).from_select(
+            ["view_date", "page", "count"],
+            select(PageView.view_date, PageView.page, func.count(PageView.id))
+            .where(PageView.view_date.isnot(None))
+            .group_by(PageView.view_date, PageView.page),
+        )
+    )
+    db.commit()
+
+
+def ensure_page_view_rollups(db: Session) -> bool:
+    has_rollups = db.execute(select(PageViewDaily.view_date).limit(1)).first() is not None
+    if has_rollups:
+        return False
+    has_raw = db.execute(select(PageView.id).limit(1)).first() is not None
+    if not has_raw:
+        return False
+    rebuild_page_view_rollups(db)
+    return True
@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime, timezone
+from fastapi import HTTPException, Response
+from sqlalchemy import String, and_, or_, type_coerce
+from app.core.config import settings
+from app.core.database import is_sqlite
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at, row_id: int) -> str:
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+def created_at_param(value: datetime):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    # SQLite 以文本保存时间，server_default 写入的 CURRENT_TIMESTAMP 不带微秒；
+    # 直接绑定 datetime 会渲染成带 ".000000" 的文本，同一秒内的比较就会出错。
+    if is_sqlite(settings.DATABASE_URL) and value.microsecond == 0:
+        return type_coerce(value.strftime("%Y-%m-%d %H:%M:%S"), String)
+    return value
+
+
+def keyset_order(model):
+    return (model.created_at.desc(), model.id.desc())
+
+
+def keyset_filter(model, cursor: str):
+    created_at, row_id = decode_cursor(cursor)
+    created_at = created_at_param(created_at)
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < row_id),
+    )
+
+
+def next_cursor_headers(items, limit: int) -> dict:
+    if not isinstance(items, list) or not items or len(items) < limit:
+        return {}
+    last = items[-1]
+    if isinstance(last, dict):
+        created_at, row_id = last.get("created_at"), last.get("id")
+    else:
+        created_at, row_id = last.created_at, last.id
+    if created_at is None:
+        return {}
+    return {NEXT_CURSOR_HEADER: encode_cursor(created_at, row_id)}
+
+
+def set_next_cursor(response: Response, items, limit: int):
+    response.headers.update(next_cursor_headers(items, limit))
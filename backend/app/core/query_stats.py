@@ -0,0 +1,145 @@
+import contextvars
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "total_ms", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = {}
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> list:
+        return [
+            (statement, count)
+            for statement, count in self.statements.items()
+            if count >= threshold and statement.lstrip()[:6].upper() == "SELECT"
+        ]
+
+
+class QueryTotals:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.total_ms = 0.0
+        self.slow = 0
+        self.n_plus_one = 0
+
+    def add(self, elapsed_ms: float, slow: bool):
+        with self._lock:
+            self.queries += 1
+            self.total_ms += elapsed_ms
+            if slow:
+                self.slow += 1
+
+    def stats(self) -> dict:
+        return {
+            "queries": self.queries,
+            "total_ms": round(self.total_ms, 3),
+            "slow_queries": self.slow,
+            "n_plus_one_warnings": self.n_plus_one,
+            "slow_query_ms": settings.SLOW_QUERY_MS,
+        }
+
+
+query_totals = QueryTotals()
+_current = contextvars.ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def explain(conn, cursor, statement: str, parameters, executemany: bool) -> Optional[str]:
+    if executemany or conn.dialect.is_async or statement.lstrip()[:6].upper() != "SELECT":
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # 直接用底层 DBAPI 游标执行，避免再次触发本模块的事件钩子
+    raw = cursor.connection.cursor()
+    try:
+        raw.execute(prefix + statement, parameters)
+        return "\n".join(str(row[-1]) for row in raw.fetchall())
+    finally:
+        raw.close()
+
+
+def log_slow_query(conn, cursor, statement: str, parameters, executemany: bool, elapsed_ms: float):
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN:
+        try:
+            plan = explain(conn, cursor, statement, parameters, executemany)
+        except Exception as e:
+            plan = f"无法获取执行计划: {e}"
+    params = repr(parameters)
+    if len(params) > 500:
+        params = params[:500] + "..."
+    message = f"慢查询 {elapsed_ms:.1f}ms: {statement}\n参数: {params}"
+    if plan:
+        message += f"\n执行计划:\n{plan}"
+    logger.warning(message)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and settings.SQL_STATS_ENABLED:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    slow = elapsed_ms >= settings.SLOW_QUERY_MS
+    query_totals.add(elapsed_ms, slow)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if slow:
+        log_slow_query(conn, cursor, statement, parameters, executemany, elapsed_ms)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(stats.count).encode("latin-1")))
+                headers.append((b"x-query-time-ms", f"{stats.total_ms:.2f}".encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            for statement, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                query_totals.n_plus_one += 1
+                logger.warning(
+                    f"疑似 N+1 查询: {scope['method']} {scope['path']} 中同一语句执行了 {count} 次: "
+                    f"{' '.join(statement.split())[:300]}"
+                )
@@ -0,0 +1,94 @@
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from app.core.config import settings
+
+
+TRUSTED_PROXY_NETWORKS = [ipaddress.ip_network(p, strict=False) for p in settings.TRUSTED_PROXIES]
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXY_NETWORKS)
+
+
+def client_ip(request: Request) -> str:
+    peer = request.client.host if request.client else None
+    # 只有直连方是我们自己的反向代理时才认 X-Real-IP，否则客户端可以随意伪造
+    if peer and TRUSTED_PROXY_NETWORKS and is_trusted_proxy(peer):
+        real_ip = request.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip.strip()
+    return peer or "unknown"
+
+
+class TokenBucketLimiter:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = {}
+        self.limited = {}
+        self.shed = {}
+
+    def acquire(self, key, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = float(burst)
+            else:
+                tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                self._buckets.move_to_end(key)
+                # 被挤出的键等同于桶已回满，只会让该 IP 多拿到一次突发额度
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            return (1.0 - tokens) / rate if rate > 0 else 60.0
+
+    def count(self, counters: dict, route: str):
+        with self._lock:
+            counters[route] = counters.get(route, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.RATE_LIMIT_ENABLED,
+                "tracked_keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "allowed": dict(self.allowed),
+                "limited": dict(self.limited),
+                "shed": dict(self.shed),
+            }
+
+
+rate_limiter = TokenBucketLimiter(settings.RATE_LIMIT_MAX_KEYS)
+
+
+def rate_limit(route: str, rate: float, burst: int, overloaded=None):
+    async def dependency(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if overloaded is not None and overloaded():
+            rate_limiter.count(rate_limiter.shed, route)
+            raise HTTPException(status_code=503, detail="服务繁忙，请稍后重试", headers={"Retry-After": "1"})
+        retry_after = rate_limiter.acquire((route, client_ip(request)), rate, burst)
+        if retry_after:
+            rate_limiter.count(rate_limiter.limited, route)
+            raise HTTPException(
+                status_code=429,
+                detail="请求过于频繁，请稍后再试",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+        rate_limiter.count(rate_limiter.allowed, route)
+    return dependency
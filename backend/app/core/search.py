@@ -0,0 +1,255 @@
+import html
+import re
+from typing import List, Optional
+from sqlalchemy import bindparam, event, or_, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import is_sqlite
+from app.models.news import News
+from app.models.case import Case
+
+CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+CJK_RE = re.compile(f"[{CJK}]+")
+TOKEN_RE = re.compile(f"[{CJK}]+|[^\\W_{CJK}]+")
+INLINE_TAG_RE = re.compile(r"</?(?:a|b|i|u|em|strong|span|font|mark|sub|sup)\b[^>]*>", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def strip_html(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return html.unescape(TAG_RE.sub(" ", INLINE_TAG_RE.sub("", value)))
+
+
+def _bigrams(run: str) -> List[str]:
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def segment(value: str) -> str:
+    tokens = []
+    for run in TOKEN_RE.findall(value):
+        if CJK_RE.fullmatch(run):
+            tokens.extend(_bigrams(run))
+        else:
+            tokens.append(run.lower())
+    return " ".join(tokens)
+
+
+def query_terms(q: str) -> List[str]:
+    return TOKEN_RE.findall(q)[:16]
+
+
+def build_match_query(terms: List[str]) -> str:
+    parts = []
+    for term in terms:
+        if CJK_RE.fullmatch(term) and len(term) > 1:
+            parts.append('"' + " ".join(_bigrams(term)) + '"')
+        else:
+            parts.append(f'"{term.lower()}"*')
+    return " ".join(parts)
+
+
+def highlight(value: str, terms: List[str], width: int = 120) -> str:
+    value = " ".join(value.split())
+    if not terms:
+        return html.escape(value[:width])
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    match = pattern.search(value)
+    start = max(0, match.start() - width // 3) if match else 0
+    window = value[start:start + width]
+    parts = []
+    last = 0
+    for m in pattern.finditer(window):
+        parts.append(html.escape(window[last:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group(0))}</mark>")
+        last = m.end()
+    parts.append(html.escape(window[last:]))
+    snippet = "".join(parts)
+    if start > 0:
+        snippet = "…" + snippet
+    if start + width < len(value):
+        snippet += "…"
+    return snippet
+
+
+class SearchSource:
+    def __init__(self, kind: str, model, fts_table: str, title_field: str, body_fields: List[str], visible=None):
+        self.kind = kind
+        self.model = model
+        self.fts_table = fts_table
+        self.title_field = title_field
+        self.body_fields = body_fields
+        self.visible = visible
+
+    def title(self, row) -> str:
+        return getattr(row, self.title_field) or ""
+
+    def body(self, row) -> str:
+        return " ".join(strip_html(getattr(row, f)) for f in self.body_fields if getattr(row, f))
+
+    def document(self, row) -> dict:
+        return {"id": row.id, "title": segment(self.title(row)), "body": segment(self.body(row))}
+
+
+SEARCH_SOURCES = {
+    "news": SearchSource("news", News, "news_fts", "title", ["summary", "content"], News.is_published == True),
+    "cases": SearchSource("cases", Case, "cases_fts", "title", ["description", "location", "service_type", "area"]),
+}
+
+
+class SearchIndex:
+    def __init__(self, sources: dict):
+        self.sources = sources
+        self.enabled = False
+
+    def ensure(self, db: Session) -> bool:
+        if not is_sqlite(settings.DATABASE_URL):
+            self.enabled = False
+            return False
+        try:
+            for source in self.sources.values():
+                db.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {source.fts_table} "
+                    f"USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"
+                ))
+            db.commit()
+        except OperationalError as e:
+            db.rollback()
+            print(f"FTS5 不可用，搜索将退回 LIKE 查询: {e}")
+            self.enabled = False
+            return False
+        self.enabled = True
+        rebuilt = False
+        for source in self.sources.values():
+            indexed = db.execute(text(f"SELECT count(*) FROM {source.fts_table}")).scalar()
+            if not indexed and db.query(source.model.id).first() is not None:
+                self.rebuild(db, source)
+                rebuilt = True
+        return rebuilt
+
+    def rebuild(self, db: Session, source: SearchSource = None) -> int:
+        count = 0
+        for source in [source] if source else self.sources.values():
+            db.execute(text(f"DELETE FROM {source.fts_table}"))
+            batch = []
+            for row in db.query(source.model).yield_per(500):
+                batch.append(source.document(row))
+                if len(batch) >= 500:
+                    self._insert(db, source, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self._insert(db, source, batch)
+                count += len(batch)
+        db.commit()
+        return count
+
+    def _insert(self, conn, source: SearchSource, documents: List[dict]):
+        conn.execute(
+            text(f"INSERT INTO {source.fts_table} (rowid, title, body) VALUES (:id, :title, :body)"),
+            documents,
+        )
+
+    def _delete(self, conn, source: SearchSource, row_id: int):
+        conn.execute(text(f"DELETE FROM {source.fts_table} WHERE rowid = :id"), {"id": row_id})
+
+    def sync_rows(self, db: Session, model, ids: List[int]):
+        source = next((s for s in self.sources.values() if s.model is model), None)
+        if not self.enabled or source is None or not ids:
+            return
+        db.execute(
+            text(f"DELETE FROM {source.fts_table} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(ids)},
+        )
+        rows = db.query(model).filter(model.id.in_(ids)).execution_options(populate_existing=True).all()
+        if rows:
+            self._insert(db, source, [source.document(row) for row in rows])
+
+    def listen(self):
+        for source in self.sources.values():
+            def on_change(mapper, connection, target, source=source):
+                if not self.enabled:
+                    return
+                self._delete(connection, source, target.id)
+                self._insert(connection, source, [source.document(target)])
+
+            def on_delete(mapper, connection, target, source=source):
+                if self.enabled:
+                    self._delete(connection, source, target.id)
+
+            event.listen(source.model, "after_insert", on_change)
+            event.listen(source.model, "after_update", on_change)
+            event.listen(source.model, "after_delete", on_delete)
+
+    def _fts_hits(self, db: Session, sources: List[SearchSource], match: str, skip: int, limit: int):
+        selects = []
+        for source in sources:
+            table = source.model.__tablename__
+            condition = f" AND {table}.is_published = 1" if source.visible is not None else ""
+            selects.append(
+                f"SELECT '{source.kind}' AS kind, {source.fts_table}.rowid AS id, "
+                f"bm25({source.fts_table}, 10.0, 1.0) AS score "
+                f"FROM {source.fts_table} JOIN {table} ON {table}.id = {source.fts_table}.rowid "
+                f"WHERE {source.fts_table} MATCH :match{condition}"
+            )
+        union = " UNION ALL ".join(selects)
+        total = db.execute(text(f"SELECT count(*) FROM ({union})"), {"match": match}).scalar()
+        rows = db.execute(
+            text(f"{union} ORDER BY score LIMIT :limit OFFSET :skip"),
+            {"match": match, "limit": limit, "skip": skip},
+        ).all()
+        return total, [(row.kind, row.id, round(-row.score, 6)) for row in rows]
+
+    def _like_hits(self, db: Session, sources: List[SearchSource], terms: List[str], skip: int, limit: int):
+        hits = []
+        for source in sources:
+            model = source.model
+            columns = [getattr(model, source.title_field)] + [getattr(model, f) for f in source.body_fields]
+            query = select(model.id, model.created_at)
+            for term in terms:
+                query = query.where(or_(*[c.ilike(f"%{term}%") for c in columns]))
+            if source.visible is not None:
+                query = query.where(source.visible)
+            hits.extend((source.kind, row.id, None, row.created_at) for row in db.execute(query))
+        hits.sort(key=lambda hit: (hit[3] is not None, hit[3]), reverse=True)
+        return len(hits), [hit[:3] for hit in hits[skip:skip + limit]]
+
+    def search(self, db: Session, q: str, kinds: List[str], skip: int, limit: int) -> dict:
+        terms = query_terms(q)
+        if not terms:
+            return {"total": 0, "items": []}
+        sources = [self.sources[kind] for kind in kinds]
+        if self.enabled:
+            total, hits = self._fts_hits(db, sources, build_match_query(terms), skip, limit)
+        else:
+            total, hits = self._like_hits(db, sources, terms, skip, limit)
+
+        rows = {}
+        for source in sources:
+            ids = [row_id for kind, row_id, _ in hits if kind == source.kind]
+            if ids:
+                for row in db.query(source.model).filter(source.model.id.in_(ids)):
+                    rows[(source.kind, row.id)] = row
+        items = []
+        for kind, row_id, score in hits:
+            row = rows.get((kind, row_id))
+            if row is None:
+                continue
+            source = self.sources[kind]
+            items.append({
+                "type": kind,
+                "id": row.id,
+                "title": highlight(source.title(row), terms, width=200),
+                "snippet": highlight(source.body(row), terms),
+                "cover_image": row.cover_image,
+                "created_at": row.created_at,
+                "score": score,
+            })
+        return {"total": total, "items": items}
+
+
+search_index = SearchIndex(SEARCH_SOURCES)
+search_index.listen()
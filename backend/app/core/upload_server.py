@@ -0,0 +1,285 @@
+import mimetypes
+import os
+import posixpath
+import stat
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Optional
+import anyio
+from app.core.config import settings
+from app.core.upload_storage import (
+    HASHED_PATH_RE,
+    IMMUTABLE_CACHE_CONTROL,
+    MUTABLE_CACHE_CONTROL,
+    UPLOAD_DIR,
+    is_immutable_path,
+)
+
+CHUNK_SIZE = 64 * 1024
+PRECOMPRESSED_EXTS = {".svg"}
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class UploadFileInfo:
+    __slots__ = ("full_path", "size", "mtime_ns", "etag", "headers", "body")
+
+    def __init__(self, full_path: str, size: int, mtime_ns: int, etag: str, headers: list, body: Optional[bytes]):
+        self.full_path = full_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.etag = etag
+        self.headers = headers
+        self.body = body
+
+
+def _strong_etag(path: str, st, encoding: Optional[str]) -> str:
+    match = HASHED_PATH_RE.match(path)
+    if match and path.endswith(match.group(1) + os.path.splitext(path)[1]):
+        tag = match.group(1)
+    else:
+        tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return f'"{tag}"'
+
+
+def _parse_range(value: str, size: int):
+    if not value.startswith("bytes=") or "," in value:
+        return None
+    start, _, end = value[6:].strip().partition("-")
+    try:
+        if start == "":
+            length = int(end)
+            if length <= 0:
+                return False
+            return max(0, size - length), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+class UploadServer:
+    def __init__(self, directory: str, max_cache_bytes: int, max_cached_file_size: int):
+        self.directory = os.path.realpath(directory)
+        self.max_cache_bytes = max_cache_bytes
+        self.max_cached_file_size = max_cached_file_size
+        self._files = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.precompressed = 0
+
+    def _resolve(self, path: str) -> Optional[str]:
+        full_path = os.path.realpath(os.path.join(self.directory, path))
+        if not full_path.startswith(self.directory + os.sep):
+            return None
+        return full_path
+
+    def _cached(self, key: tuple) -> Optional[UploadFileInfo]:
+        with self._lock:
+            info = self._files.get(key)
+            if info is not None:
+                self._files.move_to_end(key)
+            return info
+
+    def _remember(self, key: tuple, info: UploadFileInfo):
+        if info.body is None:
+            return
+        with self._lock:
+            old = self._files.pop(key, None)
+            if old is not None:
+                self._cached_bytes -= len(old.body)
+            self._files[key] = info
+            self._cached_bytes += len(info.body)
+            while self._cached_bytes > self.max_cache_bytes and self._files:
+                _, evicted = self._files.popitem(last=False)
+                self._cached_bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def _load(self, path: str, full_path: str, encoding: Optional[str], st) -> UploadFileInfo:
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "image/svg+xml":
+            content_type += "; charset=utf-8"
+        headers = [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"last-modified", formatdate(st.st_mtime, usegmt=True).encode("latin-1")),
+            (b"cache-control", (IMMUTABLE_CACHE_CONTROL if is_immutable_path(path) else MUTABLE_CACHE_CONTROL).encode("latin-1")),
+            (b"accept-ranges", b"bytes"),
+        ]
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        if encoding or os.path.splitext(path)[1] in PRECOMPRESSED_EXTS:
+            headers.append((b"vary", b"Accept-Encoding"))
+        body = None
+        if st.st_size <= self.max_cached_file_size:
+            with open(full_path, "rb") as f:
+                body = f.read()
+        etag = _strong_etag(path, st, encoding)
+        headers.append((b"etag", etag.encode("latin-1")))
+        return UploadFileInfo(full_path, st.st_size, st.st_mtime_ns, etag, headers, body)
+
+    def _lookup(self, path: str, full_path: str, encoding: Optional[str]) -> Optional[UploadFileInfo]:
+        key = (path, encoding)
+        info = self._cached(key)
+        if info is not None and is_immutable_path(path):
+            self.hits += 1
+            return info
+        try:
+            st = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        if info is not None and info.mtime_ns == st.st_mtime_ns and info.size == st.st_size:
+            self.hits += 1
+            return info
+        self.misses += 1
+        info = self._load(path, full_path, encoding, st)
+        self._remember(key, info)
+        return info
+
+    def _select(self, path: str, full_path: str, accept_encoding: str):
+        if os.path.splitext(path)[1] in PRECOMPRESSED_EXTS:
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding in accept_encoding:
+                    info = self._lookup(path + suffix, full_path + suffix, encoding)
+                    if info is not None:
+                        self.precompressed += 1
+                        return info
+        return self._lookup(path, full_path, None)
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._send_empty(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        path = posixpath.normpath(path.lstrip("/"))
+        if path in (".", "") or path.startswith("..") or "\x00" in path or "\\" in path:
+            await self._send_text(send, 404, b"Not Found")
+            return
+
+        request_headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        accept_encoding = request_headers.get("accept-encoding", "")
+        info = self._lookup_cached_fast(path, accept_encoding)
+        if info is None:
+            full_path = self._resolve(path)
+            if full_path is not None:
+                info = await anyio.to_thread.run_sync(self._select, path, full_path, accept_encoding)
+        if info is None:
+            await self._send_text(send, 404, b"Not Found")
+            return
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or info.etag in [t.strip() for t in if_none_match.split(",")]):
+            self.not_modified += 1
+            headers = [h for h in info.headers if h[0] != b"content-type"]
+            await self._send_empty(send, 304, headers)
+            return
+
+        start, end = 0, info.size - 1
+        status_code = 200
+        headers = list(info.headers)
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (if_range is None or if_range == info.etag):
+            byte_range = _parse_range(range_header, info.size)
+            if byte_range is False:
+                await self._send_empty(send, 416, [(b"content-range", f"bytes */{info.size}".encode("latin-1"))])
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                status_code = 206
+                self.partial += 1
+                headers.append((b"content-range", f"bytes {start}-{end}/{info.size}".encode("latin-1")))
+        length = end - start + 1 if info.size else 0
+        headers.append((b"content-length", str(length).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        if method == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+        elif info.body is not None:
+            await send({"type": "http.response.body", "body": info.body[start:end + 1]})
+        elif status_code == 200 and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": info.full_path})
+        else:
+            await self._send_file(send, info.full_path, start, length)
+
+    def _lookup_cached_fast(self, path: str, accept_encoding: str) -> Optional[UploadFileInfo]:
+        if not is_immutable_path(path):
+            return None
+        if os.path.splitext(path)[1] in PRECOMPRESSED_EXTS:
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding in accept_encoding:
+                    info = self._cached((path + suffix, encoding))
+                    if info is not None:
+                        self.hits += 1
+                        self.precompressed += 1
+                        return info
+            return None
+        info = self._cached((path, None))
+        if info is not None:
+            self.hits += 1
+        return info
+
+    async def _send_file(self, send, full_path: str, start: int, length: int):
+        async with await anyio.open_file(full_path, "rb") as f:
+            await f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b""})
+
+    async def _send_empty(self, send, status_code: int, headers: list):
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_text(self, send, status_code: int, body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode("latin-1"))],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached_files": len(self._files),
+            "cached_bytes": self._cached_bytes,
+            "max_cache_bytes": self.max_cache_bytes,
+            "max_cached_file_size": self.max_cached_file_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+            "partial": self.partial,
+            "precompressed": self.precompressed,
+        }
+
+
+upload_server = UploadServer(
+    directory=UPLOAD_DIR,
+    max_cache_bytes=settings.UPLOAD_CACHE_MAX_BYTES,
+    max_cached_file_size=settings.UPLOAD_CACHE_MAX_FILE_SIZE,
+)
@@ -0,0 +1,49 @@
+import os
+import re
+from typing import Set
+from sqlalchemy import String
+from sqlalchemy.orm import Session
+from app.models.news import News
+from app.models.case import Case
+from app.models.service import Service
+from app.models.company import Company
+from app.core.json_types import JSONList
+
+UPLOAD_DIR = "uploads"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "public, max-age=3600"
+
+HASHED_PATH_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(?:_\d+w\.webp|\.[a-z0-9]+(?:\.gz|\.br)?)$")
+UPLOAD_REF_RE = re.compile(r"/uploads/([^\s\"'()<>?#\\]+)")
+REFERENCE_MODELS = (News, Case, Service, Company)
+
+
+def content_path(digest: str, ext: str) -> str:
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_immutable_path(path: str) -> bool:
+    return HASHED_PATH_RE.match(path.replace(os.sep, "/")) is not None and not path.endswith(".manifest.json")
+
+
+def original_of(path: str) -> str:
+    if path.endswith((".gz", ".br")):
+        path = path[:-3]
+    stem, ext = os.path.splitext(path)
+    if path.endswith(".manifest.json"):
+        return path[:-len(".manifest.json")]
+    match = re.match(r"^(.*)_\d+w$", stem)
+    if ext == ".webp" and match:
+        return match.group(1)
+    return stem
+
+
+def collect_references(db: Session) -> Set[str]:
+    refs = set()
+    for model in REFERENCE_MODELS:
+        columns = [c for c in model.__table__.columns if isinstance(c.type, (String, JSONList))]
+        for row in db.query(*columns).yield_per(500):
+            for value in row:
+                if value:
+                    refs.update(os.path.splitext(m)[0] for m in UPLOAD_REF_RE.findall(str(value)))
+    return refs
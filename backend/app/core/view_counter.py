@@ -0,0 +1,94 @@
+import time
+from sqlalchemy import bindparam, update
+from app.core.background import BackgroundFlusher
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.news import News
+
+
+class ViewCounter(BackgroundFlusher):
+    def __init__(self, model, batch_size: int, interval: float, cache_namespace: str = None, cache_refresh: float = 0.0):
+        super().__init__(f"{model.__tablename__}-view-counter", interval, batch_size)
+        self.cache_namespace = cache_namespace
+        self.cache_refresh = cache_refresh
+        self._cache_stale = False
+        self._cache_bumped_at = 0.0
+        table = model.__table__
+        self._statement = (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values(
+                view_count=table.c.view_count + bindparam("increment"),
+                updated_at=table.c.updated_at,
+            )
+        )
+        self._counts = {}
+        self.increments = 0
+
+    def increment(self, row_id: int, amount: int = 1) -> int:
+        with self._cond:
+            pending = self._counts.get(row_id, 0) + amount
+            self._counts[row_id] = pending
+            self.increments += amount
+            if len(self._counts) >= self.batch_size:
+                self._cond.notify_all()
+        return pending
+
+    def pending_for(self, row_id: int) -> int:
+        return self._counts.get(row_id, 0)
+
+    def pending(self) -> int:
+        return len(self._counts)
+
+    def _refresh_cache(self):
+        # 写入的浏览量要让响应缓存失效才能被看到；每次刷新都失效会让整个命名空间的缓存
+        # 形同虚设，所以最多每 cache_refresh 秒失效一次，期间写入的计数留到下一次。
+        if not self._cache_stale or self.cache_namespace is None:
+            return
+        now = time.monotonic()
+        if now - self._cache_bumped_at < self.cache_refresh:
+            return
+        self._cache_stale = False
+        self._cache_bumped_at = now
+        response_cache.bump(self.cache_namespace)
+
+    def _flush_once(self) -> int:
+        with self._cond:
+            row_ids = list(self._counts)[:self.batch_size]
+            batch = [{"row_id": row_id, "increment": self._counts.pop(row_id)} for row_id in row_ids]
+        if not batch:
+            self._refresh_cache()
+            return 0
+        db = SessionLocal()
+        try:
+            db.execute(self._statement, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._cond:
+                for item in batch:
+                    self._counts[item["row_id"]] = self._counts.get(item["row_id"], 0) + item["increment"]
+            raise
+        finally:
+            db.close()
+        self._cache_stale = True
+        self._refresh_cache()
+        return len(batch)
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data.update({
+            "pending_increments": sum(self._counts.values()),
+            "increments": self.increments,
+        })
+        return data
+
+
+news_view_counter = ViewCounter(
+    News,
+    batch_size=settings.NEWS_VIEW_FLUSH_BATCH_SIZE,
+    interval=settings.NEWS_VIEW_FLUSH_INTERVAL,
+    cache_namespace="news",
+    cache_refresh=settings.NEWS_VIEW_CACHE_REFRESH,
+)
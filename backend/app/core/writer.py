@@ -0,0 +1,149 @@
+import contextvars
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core.background import BackgroundFlusher
+from app.core.config import settings
+from app.core.database import apply_sqlite_pragmas, is_sqlite, json_serializer
+
+
+def create_writer_engine(url: str):
+    if not is_sqlite(url):
+        return create_engine(url, poolclass=QueuePool, pool_size=1, max_overflow=0, json_serializer=json_serializer)
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        json_serializer=json_serializer,
+    )
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+    # pysqlite 自己管理 BEGIN，会让 SAVEPOINT 失效；改为手动发 BEGIN IMMEDIATE，
+    # 写事务一开始就拿到写锁，避免提交时才发现被其他连接锁住。
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+class WriteQueue(BackgroundFlusher):
+    def __init__(self, batch_size: int, interval: float, timeout: float):
+        super().__init__("write-queue", interval, batch_size)
+        self.timeout = timeout
+        self.enabled = False
+        self._queue = deque()
+        self._engine = None
+        self._session_factory = None
+        self._session = None
+        self.submitted = 0
+        self.failed_units = 0
+        self.commit_failures = 0
+
+    def start(self):
+        if ":memory:" in settings.DATABASE_URL:
+            return
+        if self._engine is None:
+            self._engine = create_writer_engine(settings.DATABASE_URL)
+            self._session_factory = sessionmaker(bind=self._engine, autoflush=False, expire_on_commit=False)
+        self.enabled = True
+        super().start()
+
+    def stop(self, timeout: float = 10.0):
+        self.enabled = False
+        super().stop(timeout)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def submit(self, fn) -> Future:
+        future = Future()
+        with self._cond:
+            self._queue.append((fn, future, contextvars.copy_context()))
+            self.submitted += 1
+            self._cond.notify_all()
+        return future
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _flush_once(self) -> int:
+        with self._cond:
+            units = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        if not units:
+            return 0
+        if self._session is None:
+            self._session = self._session_factory()
+        session = self._session
+        done = []
+        for fn, future, context in units:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with session.begin_nested():
+                    result = context.run(fn, session)
+            except Exception as e:
+                self.failed_units += 1
+                future.set_exception(e)
+            else:
+                done.append((future, result))
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.commit_failures += 1
+            for future, _ in done:
+                future.set_exception(e)
+            raise
+        finally:
+            session.expunge_all()
+        for future, result in done:
+            future.set_result(result)
+        return len(units)
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data.update({
+            "enabled": self.enabled,
+            "queue_depth": data["pending"],
+            "submitted": self.submitted,
+            "failed_units": self.failed_units,
+            "commit_failures": self.commit_failures,
+            "avg_group_size": round(self.flushed_items / self.flush_count, 2) if self.flush_count else 0.0,
+        })
+        return data
+
+
+write_queue = WriteQueue(
+    batch_size=settings.WRITE_QUEUE_BATCH_SIZE,
+    interval=settings.WRITE_QUEUE_INTERVAL,
+    timeout=settings.WRITE_QUEUE_TIMEOUT,
+)
+
+
+def run_write(db: Session, fn):
+    if not write_queue.enabled or not write_queue.running:
+        result = fn(db)
+        db.commit()
+        return result
+    future = write_queue.submit(fn)
+    try:
+        return future.result(write_queue.timeout)
+    except TimeoutError:
+        # 只有还没开始执行的写入单元才能撤回；已经在执行的必须等它提交完，
+        # 否则客户端按 503 重试会产生重复数据。
+        if future.cancel():
+            raise HTTPException(status_code=503, detail="写入队列繁忙，请稍后重试")
+        return future.result()
@@ -1,11 +1,27 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+import hmac
+import ipaddress
 import os
+from app.core.body_limit import BodySizeLimitMiddleware
 from app.core.config import settings
-from app.core.database import SessionLocal, init_db
+from app.core.database import SessionLocal, async_engine, get_database_status, init_db
+from app.core.image_variants import image_variants
 from app.core.init_db import init_db_data
+from app.core.json_types import migrate_json_columns
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.page_view_buffer import page_view_buffer
+from app.core.page_view_rollup import ensure_page_view_rollups
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.search import search_index
+from app.core.security import password_hasher
+from app.core.upload_server import upload_server
+from app.core.upload_storage import UPLOAD_DIR
+from app.core.view_counter import news_view_counter
+from app.core.writer import write_queue
 from app.api.v1 import api_router
 
 
@@ -18,8 +34,15 @@ async def lifespan(app: FastAPI):
         
         db = SessionLocal()
         try:
+            fixed = migrate_json_columns(db)
+            if fixed:
+                print(f"已规范化 {fixed} 条 JSON 字段数据")
             init_db_data(db)
             print("初始数据加载成功")
+            if ensure_page_view_rollups(db):
+                print("访问量汇总表已从原始数据回填")
+            if search_index.ensure(db):
+                print("全文搜索索引已重建")
         except Exception as e:
             print(f"初始数据加载警告: {e}")
         finally:
@@ -27,14 +50,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"数据库初始化错误: {e}")
     
-    if not os.path.exists("uploads"):
-        os.makedirs("uploads")
+    if not os.path.exists(UPLOAD_DIR):
+        os.makedirs(UPLOAD_DIR)
+    
+    if settings.WRITE_QUEUE_ENABLED:
+        write_queue.start()
+    if settings.PAGE_VIEW_BUFFER_ENABLED:
+        page_view_buffer.start()
+    news_view_counter.start()
     
     print(f"服务启动: {settings.PROJECT_NAME}")
     print(f"API文档: http://localhost:8000/docs")
     
     yield
     
+    write_queue.stop()
+    page_view_buffer.stop()
+    news_view_counter.stop()
+    password_hasher.shutdown()
+    image_variants.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
     print("服务关闭")
 
 
@@ -44,6 +80,7 @@ app = FastAPI(
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -52,16 +89,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Query-Count", "X-Query-Time-Ms"],
+)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    path_prefix=f"{settings.API_V1_STR}/upload",
+    max_size=settings.UPLOAD_MAX_REQUEST_SIZE,
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", upload_server, name="uploads")
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "宜然焕新API服务运行正常"}
+    try:
+        database = await run_in_threadpool(get_database_status)
+    except Exception as e:
+        database = {"error": str(e)}
+    return {"status": "healthy", "message": "宜然焕新API服务运行正常", "database": database}
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("authorization", "")
+        if not hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=403, detail="权限不足")
+    elif not is_loopback(request.client.host if request.client else ""):
+        raise HTTPException(status_code=403, detail="权限不足")
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
 
 
 @app.get("/")
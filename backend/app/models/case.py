@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.json_types import JSONList
 
 
 class Case(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        Index("ix_cases_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -13,7 +17,7 @@ class Case(Base):
     service_type = Column(String(50), nullable=True)
     area = Column(String(50), nullable=True)
     cover_image = Column(String(255), nullable=True)
-    images = Column(Text, nullable=True)
+    images = Column(JSONList, nullable=True)
     is_featured = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
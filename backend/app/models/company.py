@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, Float
 from app.core.database import Base
+from app.core.json_types import JSONList
 
 
 class Company(Base):
@@ -18,6 +19,6 @@ class Company(Base):
     copyright_text = Column(String(200), default="© 2024 福建省宜然焕新科技有限公司 版权所有")
     icp = Column(String(50), nullable=True)
     business_hours = Column(String(100), nullable=True)
-    banner_images = Column(Text, nullable=True)
+    banner_images = Column(JSONList, nullable=True)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
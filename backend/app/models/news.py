@@ -1,17 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Index, Integer, String, Text, Boolean, DateTime
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.json_types import JSONList
 
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        Index("ix_news_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     summary = Column(String(500), nullable=True)
     content = Column(Text, nullable=False)
     cover_image = Column(Text, nullable=True)
-    images = Column(Text, nullable=True)
+    images = Column(JSONList, nullable=True)
     category = Column(String(50), default="公司新闻")
     is_published = Column(Boolean, default=True)
     view_count = Column(Integer, default=0)
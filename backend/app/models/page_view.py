@@ -12,3 +12,18 @@ class PageView(Base):
     user_agent = Column(String(500), nullable=True)
     view_date = Column(Date, default=date.today)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PageViewDaily(Base):
+    __tablename__ = "page_view_daily"
+
+    view_date = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class PageViewDailyPage(Base):
+    __tablename__ = "page_view_daily_pages"
+
+    view_date = Column(Date, primary_key=True)
+    page = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Text, Boolean
 from sqlalchemy.sql import func
 from sqlalchemy import DateTime
 from app.core.database import Base
+from app.core.json_types import JSONList
 
 
 class Service(Base):
@@ -13,7 +14,7 @@ class Service(Base):
     description = Column(Text, nullable=True)
     icon = Column(String(100), nullable=True)
     image = Column(Text, nullable=True)
-    features = Column(Text, nullable=True)
+    features = Column(JSONList, nullable=True)
     price_range = Column(String(100), nullable=True)
     duration = Column(String(50), nullable=True)
     is_featured = Column(Boolean, default=False)
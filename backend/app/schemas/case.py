@@ -1,7 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-import json
 
 
 class CaseCreate(BaseModel):
@@ -26,6 +25,29 @@ class CaseUpdate(BaseModel):
     is_featured: Optional[int] = None
 
 
+class CaseListItem(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    service_type: Optional[str] = None
+    area: Optional[str] = None
+    cover_image: Optional[str] = None
+    images: Optional[List[str]] = None
+    is_featured: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class CaseBulkUpdate(CaseUpdate):
+    ids: List[int]
+
+
+class CaseBulkRequest(BaseModel):
+    create: List[CaseCreate] = []
+    update: List[CaseBulkUpdate] = []
+    delete: List[int] = []
+
+
 class CaseResponse(BaseModel):
     id: int
     title: str
@@ -43,12 +65,6 @@ class CaseResponse(BaseModel):
 
     @classmethod
     def from_orm_with_images(cls, case):
-        images = []
-        if case.images:
-            try:
-                images = json.loads(case.images)
-            except:
-                images = []
         return cls(
             id=case.id,
             title=case.title,
@@ -57,7 +73,7 @@ class CaseResponse(BaseModel):
             service_type=case.service_type,
             area=case.area,
             cover_image=case.cover_image,
-            images=images,
+            images=case.images or [],
             is_featured=case.is_featured,
             created_at=case.created_at,
         )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -12,6 +12,14 @@ class ContactCreate(BaseModel):
     message: Optional[str] = None
 
 
+class ContactBulkStatus(BaseModel):
+    status: str
+    from_status: Optional[str] = None
+    ids: Optional[List[int]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
 class ContactResponse(BaseModel):
     id: int
     name: str
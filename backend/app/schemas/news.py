@@ -1,7 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-import json
 
 
 class NewsCreate(BaseModel):
@@ -24,6 +23,29 @@ class NewsUpdate(BaseModel):
     is_published: Optional[bool] = None
 
 
+class NewsListItem(BaseModel):
+    id: int
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    content: Optional[str] = None
+    cover_image: Optional[str] = None
+    images: Optional[List[str]] = None
+    category: Optional[str] = None
+    is_published: Optional[bool] = None
+    view_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class NewsBulkUpdate(NewsUpdate):
+    ids: List[int]
+
+
+class NewsBulkRequest(BaseModel):
+    create: List[NewsCreate] = []
+    update: List[NewsBulkUpdate] = []
+    delete: List[int] = []
+
+
 class NewsResponse(BaseModel):
     id: int
     title: str
@@ -30,6 +30,16 @@ class ServiceUpdate(BaseModel):
     sort_order: Optional[int] = None
 
 
+class ServiceBulkUpdate(ServiceUpdate):
+    ids: List[int]
+
+
+class ServiceBulkRequest(BaseModel):
+    create: List[ServiceCreate] = []
+    update: List[ServiceBulkUpdate] = []
+    delete: List[int] = []
+
+
 class ServiceResponse(BaseModel):
     id: int
     name: str
@@ -0,0 +1,108 @@
+# 测量 MetricsMiddleware 给每个请求增加的 CPU 开销（进程内 ASGI 调用，空接口与带路径参数的接口各测一次）。
+#   python benchmarks/bench_metrics.py --requests 5000
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    from app.core.metrics import MetricsMiddleware
+    from app.core.responses import FastJSONResponse
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    router = APIRouter(prefix="/news")
+
+    @router.get("/")
+    async def news_list():
+        return {"ok": True}
+
+    @router.get("/{news_id}")
+    async def news_detail(news_id: int):
+        return {"id": news_id}
+
+    app.include_router(router, prefix="/api/v1")
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def measure(app, paths: list, total: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(200):
+            await client.get(paths[i % len(paths)])
+        started = time.process_time()
+        for i in range(total):
+            response = await client.get(paths[i % len(paths)])
+            assert response.status_code == 200
+        return (time.process_time() - started) / total * 1e6
+
+
+async def measure_bare(total: int) -> float:
+    from app.core.metrics import MetricsMiddleware
+
+    async def endpoint(scope, receive, send):
+        scope["endpoint"] = endpoint
+        scope["path_params"] = {"news_id": 42}
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def noop(message):
+        pass
+
+    app = MetricsMiddleware(endpoint)
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/news/42"}
+    started = time.process_time()
+    for _ in range(total):
+        await app(dict(scope), None, noop)
+    instrumented = time.process_time() - started
+    started = time.process_time()
+    for _ in range(total):
+        await endpoint(dict(scope), None, noop)
+    plain = time.process_time() - started
+    return (instrumented - plain) / total * 1e6
+
+
+async def render_metrics():
+    from app.core.metrics import metrics
+
+    metrics.render()
+    started = time.perf_counter()
+    body = metrics.render()
+    return (time.perf_counter() - started) * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        "static route": ["/api/v1/news/"],
+        "path params": [f"/api/v1/news/{i}" for i in range(100)],
+    }
+    # 各测多轮取最小值，减小进程内噪声对对比的影响
+    for name, paths in cases.items():
+        plain = min(asyncio.run(measure(build_app(False), paths, args.requests)) for _ in range(args.rounds))
+        instrumented = min(asyncio.run(measure(build_app(True), paths, args.requests)) for _ in range(args.rounds))
+        print(
+            f"{name:>14}: {plain:7.1f} us -> {instrumented:7.1f} us CPU/request "
+            f"({instrumented - plain:+6.1f} us, {(instrumented - plain) / plain * 100:+5.1f}%)"
+        )
+
+    overhead = min(asyncio.run(measure_bare(args.requests * 10)) for _ in range(args.rounds))
+    print(f"middleware alone: {overhead:.2f} us CPU/request")
+    elapsed_ms, size = asyncio.run(render_metrics())
+    print(f"/metrics render: {elapsed_ms:.2f} ms, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# 测量 bcrypt 校验吞吐：单核每秒可处理的登录次数，以及密码线程池满载时的总吞吐。
+#   python benchmarks/bench_password_hashing.py --rounds 12 --seconds 5
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+
+
+def verify_for(hashed: bytes, seconds: float) -> int:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        bcrypt.checkpw(b"admin123", hashed)
+        count += 1
+    return count
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b"admin123", bcrypt.gensalt(rounds=args.rounds))
+
+    single = verify_for(hashed, args.seconds) / args.seconds
+    print(f"rounds={args.rounds} single thread: {single:.1f} logins/s per core ({1000 / single:.1f} ms/verify)")
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        started = time.perf_counter()
+        total = sum(executor.map(lambda _: verify_for(hashed, args.seconds), range(args.workers)))
+        elapsed = time.perf_counter() - started
+    print(f"rounds={args.rounds} pool of {args.workers}: {total / elapsed:.1f} logins/s "
+          f"({total / elapsed / args.workers:.1f} per worker, cpu_count={os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# 对比同步/异步数据库引擎下公开读接口的吞吐与延迟。
+#
+# 先在两个端口分别启动服务（关闭响应缓存，让每个请求都访问数据库）：
+#   RESPONSE_CACHE_ENABLED=false ASYNC_DB_ENABLED=false uvicorn app.main:app --port 8001 --workers 1
+#   RESPONSE_CACHE_ENABLED=false ASYNC_DB_ENABLED=true  uvicorn app.main:app --port 8002 --workers 1
+# 然后运行：
+#   python benchmarks/bench_public_reads.py --concurrency 200 --requests 5000
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PATHS = [
+    "/api/v1/news/?limit=20",
+    "/api/v1/cases/?limit=20",
+    "/api/v1/services/",
+    "/api/v1/company/",
+]
+
+
+async def run(base_url: str, concurrency: int, total: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[i % len(PATHS)])
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sync-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--async-url", default="http://127.0.0.1:8002")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, url in (("sync", args.sync_url), ("async", args.async_url)):
+        result = asyncio.run(run(url, args.concurrency, args.requests))
+        print(f"{name:5s} {url}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# 对比 100 条新闻列表在几种序列化方式下每个请求的 CPU 开销（进程内 ASGI 调用，不含数据库与网络）。
+#   python benchmarks/bench_serialization.py --items 100 --requests 2000
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+
+def make_items(count: int) -> list:
+    now = datetime(2024, 6, 1, 8, 30)
+    return [
+        {
+            "id": i,
+            "title": f"宜然焕新完成福州某大型商业综合体焕新项目 {i}",
+            "summary": "近日，我司成功完成福州某大型商业综合体的整体焕新项目，获得业主高度评价。",
+            "content": "项目面积超过5000平方米，施工周期仅用15天。" * 20,
+            "cover_image": f"/uploads/ab/cd/{i:064x}.jpg",
+            "images": [f"/uploads/ab/cd/{i:064x}_{w}w.webp" for w in (320, 640, 1280)],
+            "category": "公司新闻",
+            "is_published": True,
+            "view_count": 1000 + i,
+            "created_at": now - timedelta(hours=i),
+        }
+        for i in range(count)
+    ]
+
+
+def build_apps(items: list) -> dict:
+    from app.core.responses import FastJSONResponse, dumps, trusted_json
+    from app.schemas.news import NewsListItem
+
+    body = dumps(items)
+    apps = {}
+
+    stdlib = FastAPI(default_response_class=JSONResponse)
+
+    @stdlib.get("/news", response_model=List[NewsListItem])
+    def stdlib_news():
+        return items
+
+    apps["response_model + JSONResponse"] = stdlib
+
+    default = FastAPI()
+
+    @default.get("/news", response_model=List[NewsListItem])
+    def default_news():
+        return items
+
+    apps["response_model + FastAPI default"] = default
+
+    fast = FastAPI(default_response_class=FastJSONResponse)
+
+    @fast.get("/news", response_model=List[NewsListItem])
+    def fast_news():
+        return items
+
+    apps["response_model + FastJSONResponse"] = fast
+
+    trusted = FastAPI()
+
+    @trusted.get("/news", response_model=List[NewsListItem])
+    def trusted_news():
+        return trusted_json(dumps(items))
+
+    apps["trusted, serialized per request"] = trusted
+
+    cached = FastAPI()
+
+    @cached.get("/news", response_model=List[NewsListItem])
+    def cached_news():
+        return trusted_json(body)
+
+    apps["trusted, cached bytes"] = cached
+    return apps
+
+
+async def measure(app, total: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get("/news")
+        started = time.process_time()
+        for _ in range(total):
+            response = await client.get("/news")
+            assert response.status_code == 200
+        return (time.process_time() - started) / total * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from app.core import responses
+
+    print(f"orjson available: {responses.orjson is not None}, items={args.items}")
+    baseline = None
+    for name, app in build_apps(make_items(args.items)).items():
+        cpu_us = asyncio.run(measure(app, args.requests))
+        baseline = baseline or cpu_us
+        print(f"{name:>36}: {cpu_us:8.1f} us CPU/request ({baseline - cpu_us:+8.1f} us vs first)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# 对比原 StaticFiles 挂载与 UploadServer 在同一批上传文件上的吞吐（进程内 ASGI 调用，不含网络开销）。
+#   python benchmarks/bench_uploads.py --files 50 --size 40000 --requests 5000
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+
+def make_files(directory: str, count: int, size: int) -> list:
+    from app.core.upload_storage import content_path
+
+    paths = []
+    for _ in range(count):
+        body = b"\x89PNG\r\n\x1a\n" + os.urandom(size)
+        path = content_path(hashlib.sha256(body).hexdigest(), ".png")
+        os.makedirs(os.path.join(directory, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(directory, path), "wb") as f:
+            f.write(body)
+        paths.append(f"/uploads/{path}")
+    return paths
+
+
+async def run(app, paths: list, total: int, concurrency: int, headers: dict = None) -> float:
+    transport = httpx.ASGITransport(app=app)
+    counter = iter(range(total))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for i in counter:
+                response = await client.get(paths[i % len(paths)], headers=headers)
+                assert response.status_code in (200, 304), response.status_code
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def main():
+    from app.core.upload_server import UploadServer
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--size", type=int, default=40000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_files(directory, args.files, args.size)
+        apps = {
+            "StaticFiles": Starlette(routes=[Mount("/uploads", StaticFiles(directory=directory))]),
+            "UploadServer": Starlette(routes=[Mount("/uploads", UploadServer(directory, 64 * 1024 * 1024, 512 * 1024))]),
+        }
+        for name, app in apps.items():
+            asyncio.run(run(app, paths, len(paths), 1))
+            rps = asyncio.run(run(app, paths, args.requests, args.concurrency))
+            print(f"{name:>12}: {rps:.1f} req/s ({args.files} files x {args.size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+import argparse
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.getcwd())
+
+from app.core.database import SessionLocal
+from app.core.upload_storage import UPLOAD_DIR, collect_references, original_of
+
+parser = argparse.ArgumentParser(description="Remove uploads no longer referenced by news, cases, services or companies")
+parser.add_argument("--delete", action="store_true", help="actually delete files (default is a dry run)")
+parser.add_argument("--grace-hours", type=float, default=24.0, help="keep files modified within this many hours")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    refs = collect_references(db)
+finally:
+    db.close()
+print(f"Referenced uploads: {len(refs)}")
+
+cutoff = time.time() - args.grace_hours * 3600
+removed = 0
+freed = 0
+kept = 0
+for root, dirs, files in os.walk(UPLOAD_DIR):
+    for name in files:
+        full_path = os.path.join(root, name)
+        path = os.path.relpath(full_path, UPLOAD_DIR).replace(os.sep, "/")
+        if original_of(path) in refs:
+            kept += 1
+            continue
+        stat = os.stat(full_path)
+        if stat.st_mtime > cutoff:
+            kept += 1
+            continue
+        removed += 1
+        freed += stat.st_size
+        if args.delete:
+            os.remove(full_path)
+        print(f"{'Deleted' if args.delete else 'Unreferenced'}: {path}")
+
+if args.delete:
+    for root, dirs, files in os.walk(UPLOAD_DIR, topdown=False):
+        if root != UPLOAD_DIR and not os.listdir(root):
+            os.rmdir(root)
+
+print(f"Kept: {kept}")
+print(f"{'Deleted' if args.delete else 'Would delete'}: {removed} files, {freed / 1024 / 1024:.2f} MB")
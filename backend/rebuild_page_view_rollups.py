@@ -0,0 +1,22 @@
+import sys
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.getcwd())
+
+from app.core.database import SessionLocal, init_db
+from app.core.page_view_rollup import rebuild_page_view_rollups
+from app.models.page_view import PageView, PageViewDaily, PageViewDailyPage
+
+init_db()
+
+db = SessionLocal()
+try:
+    raw_count = db.query(PageView).count()
+    print(f"Raw page views: {raw_count}")
+    rebuild_page_view_rollups(db)
+    print(f"Daily rows: {db.query(PageViewDaily).count()}")
+    print(f"Daily page rows: {db.query(PageViewDailyPage).count()}")
+    print("Page view rollups rebuilt!")
+finally:
+    db.close()
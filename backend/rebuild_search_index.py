@@ -0,0 +1,22 @@
+import sys
+import os
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.getcwd())
+
+from app.core.database import SessionLocal, init_db
+from app.core.search import search_index
+
+init_db()
+
+db = SessionLocal()
+try:
+    search_index.ensure(db)
+    if not search_index.enabled:
+        print("FTS5 is not available for this database, nothing to rebuild")
+    else:
+        count = search_index.rebuild(db)
+        print(f"Indexed documents: {count}")
+        print("Search index rebuilt!")
+finally:
+    db.close()
@@ -57,7 +57,7 @@ export default function CasesAdminPage() {
   const fetchCases = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${API_URL}/cases/`);
+      const response = await fetch(`${API_URL}/cases/`, { cache: "no-store" });
       if (response.ok) {
         const data = await response.json();
         setCasesList(data.map((item: any) => ({
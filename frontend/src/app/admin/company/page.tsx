@@ -70,7 +70,7 @@ export default function CompanyPage() {
   const fetchCompany = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${API_URL}/company/`);
+      const response = await fetch(`${API_URL}/company/`, { cache: "no-store" });
       if (response.ok) {
         const data = await response.json();
         setFormData({
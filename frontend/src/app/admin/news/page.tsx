@@ -55,7 +55,7 @@ export default function NewsAdminPage() {
   const fetchNews = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${API_URL}/news/`);
+      const response = await fetch(`${API_URL}/news/`, { cache: "no-store" });
       if (response.ok) {
         const data = await response.json();
         setNewsList(data);
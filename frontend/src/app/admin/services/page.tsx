@@ -58,7 +58,7 @@ export default function ServicesAdminPage() {
   const fetchServices = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${API_URL}/services/`);
+      const response = await fetch(`${API_URL}/services/`, { cache: "no-store" });
       if (response.ok) {
         const data = await response.json();
         setServices(data);